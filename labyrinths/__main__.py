@@ -1,10 +1,15 @@
 """Main entry point."""
 
 import argparse
-import sys
+import os
 
-# Для лучшей генерации
-sys.setrecursionlimit(100_000)
+from labyrinths.compression import CODECS
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    """Parse maze size given as "W,H" or "WxH"."""
+    columns, rows = map(int, size.replace("x", ",").split(","))
+    return columns, rows
 
 
 def main() -> None:
@@ -14,8 +19,35 @@ def main() -> None:
     parser.add_argument("--loadfrom", help="load maze into GUI window", metavar="FILE")
 
     parser.add_argument("--generate", help="generate and save maze into file", metavar="FILE")
-    parser.add_argument("--size", help="select maze size for generation", default="59,39")
-    parser.add_argument("--algo", help="select generation algorithm", default="mst", nargs="?", choices=["mst", "dfs"])
+    parser.add_argument("--size", help="select maze size for generation, W,H or WxH", default="59,39")
+    parser.add_argument("--generate-batch", help="generate many mazes into directory", metavar="DIR")
+    parser.add_argument("--generate-archive", help="generate many mazes into SQLite archive", metavar="FILE")
+    parser.add_argument(
+        "--count", help="number of mazes for --generate-batch or --generate-archive", type=int, default=100
+    )
+    parser.add_argument(
+        "--jobs",
+        help="number of processes for --generate-batch, --generate-archive and tiled --generate (default: all cores)",
+        type=int,
+    )
+    parser.add_argument(
+        "--convert",
+        help="convert maze file into another format, chosen by extension (.maze for binary)",
+        nargs=2,
+        metavar=("SOURCE", "DEST"),
+    )
+    parser.add_argument(
+        "--mappable",
+        help="save binary maze that can be memory-mapped (with --generate or --convert)",
+        action="store_true",
+    )
+    parser.add_argument("--codec", help="compression codec (default: chosen by extension)", choices=list(CODECS))
+    parser.add_argument("--codec-stats", help="measure compression codecs on maze file", metavar="FILE")
+    parser.add_argument("--solve", help="solve maze file, solutions are cached next to it", metavar="FILE")
+    parser.add_argument("--seed", help="seed for reproducible generation", type=int)
+    parser.add_argument(
+        "--algo", help="select generation algorithm", default="mst", nargs="?", choices=["mst", "dfs", "eller", "tiled"]
+    )
     args = parser.parse_args()
 
     if not args.cli:
@@ -24,16 +56,64 @@ def main() -> None:
         main()
 
     elif args.generate:
-        from labyrinths.generators.dfs import DepthFirstSearchGenerator
-        from labyrinths.generators.kruskal import KruskalGenerator
-        from labyrinths.mazeloader import dump_maze
+        from labyrinths.generators.eller import EllerGenerator
+        from labyrinths.generators.generator import MazeGenerator
+        from labyrinths.generators.registry import get_generator_class
+        from labyrinths.generators.tiled import TiledGenerator
+        from labyrinths.mazeloader import dump_maze, dump_maze_stream, is_binary_path
 
         dest = args.generate
-        gen_class = KruskalGenerator if args.algo == "mst" else DepthFirstSearchGenerator
-        size = map(int, args.size.split(","))
-        maze = gen_class(*size).generate()
-        dump_maze(maze, dest)
+        gen_class = get_generator_class("kruskal" if args.algo == "mst" else args.algo)
+        columns, rows = parse_size(args.size)
+        if gen_class is TiledGenerator:
+            gen: MazeGenerator = TiledGenerator(columns, rows, args.seed, jobs=args.jobs or os.cpu_count() or 1)
+        else:
+            gen = gen_class(columns, rows, args.seed)
+        if isinstance(gen, EllerGenerator) and (args.mappable or is_binary_path(dest)):
+            # Stream columns straight into the file.
+            dump_maze_stream(dest, columns, rows, gen.generate_columns(), compress=not args.mappable, codec=args.codec)
+        else:
+            dump_maze(gen.generate(), dest, mappable=args.mappable, codec=args.codec)
         print(f'OK! Maze saved to "{dest}"')
+    elif args.generate_batch:
+        from labyrinths.generators.batch import generate_batch
+
+        columns, rows = parse_size(args.size)
+        algo = "kruskal" if args.algo == "mst" else args.algo
+        paths = generate_batch(args.generate_batch, args.count, columns, rows, algo, args.jobs, args.seed)
+        print(f'OK! {len(paths)} mazes saved to "{args.generate_batch}"')
+    elif args.generate_archive:
+        from labyrinths.generators.batch import generate_archive
+
+        columns, rows = parse_size(args.size)
+        algo = "kruskal" if args.algo == "mst" else args.algo
+        added = generate_archive(args.generate_archive, args.count, columns, rows, algo, args.jobs, args.seed)
+        print(f'OK! {added} new mazes saved to "{args.generate_archive}"')
+    elif args.convert:
+        from labyrinths.mazeloader import convert_maze
+
+        source, dest = args.convert
+        convert_maze(source, dest, mappable=args.mappable, codec=args.codec)
+        print(f'OK! Maze converted to "{dest}"')
+    elif args.codec_stats:
+        from labyrinths.compression import measure_all
+        from labyrinths.mazeloader import encode_maze, load_maze
+        from labyrinths.utils import dump
+
+        maze = load_maze(args.codec_stats)
+        for title, sample in [("binary", encode_maze(maze, compress=False)), ("JSON", dump(maze).encode())]:
+            print(f"{title}, {len(sample)} bytes:")
+            for stats in measure_all(sample):
+                print(f"  {stats}")
+    elif args.solve:
+        from pathlib import Path
+
+        from labyrinths.mazeloader import load_maze
+        from labyrinths.solutioncache import SolutionCache
+
+        cache = SolutionCache(directory=Path(args.solve).parent / ".solutions")
+        solution = cache.solve(load_maze(args.solve))
+        print(f"OK! Solution has {len(solution.path)} cells")
     else:
         parser.print_help()
 
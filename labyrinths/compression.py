@@ -0,0 +1,148 @@
+"""Registry of compression codecs for maze files and network packets.
+
+Every codec has a numeric id stored next to the compressed data (in the binary maze header, in every network frame),
+so data can be decompressed without knowing how it was produced. zlib codecs with different levels share one id.
+"""
+
+import bz2
+import gzip
+import lzma
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import IO, Any, Protocol
+
+
+class Compressor(Protocol):
+    """Incremental compressor, like zlib.compressobj()."""
+
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _NullCompressor:
+    def compress(self, data: bytes) -> bytes:
+        return bytes(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _identity(data: bytes) -> bytes:
+    return bytes(data)
+
+
+@dataclass(frozen=True)
+class Codec:
+    """Compression codec."""
+
+    id: int
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+    compressor: Callable[[], Compressor]
+    # Opens a file compressed as a whole, None if the codec has no file format.
+    open: Callable[..., IO[Any]] | None = None
+
+
+NONE = Codec(0, "none", _identity, _identity, _NullCompressor, open)
+ZLIB = Codec(1, "zlib", zlib.compress, zlib.decompress, zlib.compressobj)
+
+CODECS: dict[str, Codec] = {
+    codec.name: codec
+    for codec in [
+        NONE,
+        Codec(1, "zlib-1", lambda data: zlib.compress(data, 1), zlib.decompress, lambda: zlib.compressobj(1)),
+        ZLIB,
+        Codec(1, "zlib-9", lambda data: zlib.compress(data, 9), zlib.decompress, lambda: zlib.compressobj(9)),
+        Codec(2, "gzip", gzip.compress, gzip.decompress, lambda: zlib.compressobj(9, wbits=31), gzip.open),
+        Codec(3, "lzma", lzma.compress, lzma.decompress, lzma.LZMACompressor, lzma.open),
+        Codec(4, "bz2", bz2.compress, bz2.decompress, bz2.BZ2Compressor, bz2.open),
+    ]
+}
+# The codec used to decompress data with given id. zlib levels share an id, data marked with it is reported as "zlib".
+CODECS_BY_ID: dict[int, Codec] = {codec.id: codec for codec in CODECS.values()} | {ZLIB.id: ZLIB}
+
+# File suffixes of codecs with a file format.
+SUFFIXES: dict[str, str] = {".gz": "gzip", ".xz": "lzma", ".bz2": "bz2"}
+# Leading bytes of files compressed by codecs with a file format.
+MAGICS: dict[bytes, str] = {b"\x1f\x8b": "gzip", b"\xfd7zXZ\x00": "lzma", b"BZh": "bz2"}
+
+
+def get_codec(name: str) -> Codec:
+    """Get a codec by name."""
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown codec {name}, expected one of {', '.join(CODECS)}") from None
+
+
+def get_codec_by_id(codec_id: int) -> Codec:
+    """Get the codec that decompresses data marked with given id."""
+    try:
+        return CODECS_BY_ID[codec_id]
+    except KeyError:
+        raise ValueError(f"Unknown codec id {codec_id}") from None
+
+
+def codec_for_magic(head: bytes) -> Codec:
+    """Guess the codec of a file by its first bytes. Files without known magic are taken as uncompressed."""
+    for magic, name in MAGICS.items():
+        if head.startswith(magic):
+            return CODECS[name]
+    return NONE
+
+
+@dataclass
+class CodecStats:
+    """Amount of data that went through a codec and time spent on it."""
+
+    name: str
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+    compress_seconds: float = 0.0
+    decompress_seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Raw size divided by compressed size."""
+        return self.raw_bytes / self.compressed_bytes if self.compressed_bytes else 1.0
+
+    @property
+    def compress_speed(self) -> float:
+        """Raw bytes compressed per second."""
+        return self.raw_bytes / self.compress_seconds if self.compress_seconds else float("inf")
+
+    @property
+    def decompress_speed(self) -> float:
+        """Raw bytes decompressed per second."""
+        return self.raw_bytes / self.decompress_seconds if self.decompress_seconds else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: ratio {self.ratio:.2f}, compress {self.compress_speed / 1e6:.1f} MB/s, "
+            f"decompress {self.decompress_speed / 1e6:.1f} MB/s"
+        )
+
+
+def measure(codec: Codec, sample: bytes, repeat: int = 3) -> CodecStats:
+    """Measure compression ratio and speed of a codec on sample data, best of `repeat` runs."""
+    stats = CodecStats(codec.name, len(sample))
+    compress_times, decompress_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = codec.compress(sample)
+        middle = time.perf_counter()
+        codec.decompress(compressed)
+        compress_times.append(middle - start)
+        decompress_times.append(time.perf_counter() - middle)
+    stats.compressed_bytes = len(compressed)
+    stats.compress_seconds, stats.decompress_seconds = min(compress_times), min(decompress_times)
+    return stats
+
+
+def measure_all(sample: bytes, repeat: int = 3) -> list[CodecStats]:
+    """Measure every registered codec on sample data."""
+    return [measure(codec, sample, repeat) for codec in CODECS.values()]
@@ -1,25 +1,27 @@
 """Client-to-host connection."""
 
 import socket
+from collections.abc import Sequence
 from typing import Callable
 
 from typing_extensions import override
 
-from labyrinths.connection.connection import Connection
+from labyrinths.connection.connection import DEFAULT_CODECS, Connection
 
 
 class ClientToHostConnection(Connection):
     """Client-to-host connection."""
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(self, host: str, port: int, codecs: Sequence[str] = DEFAULT_CODECS) -> None:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.connect((host, port))
         sock.setblocking(False)
-        super().__init__(sock)
+        super().__init__(sock, codecs)
 
         self.established = False
         self.client_id: int | None = None
-        self.send_packet("connection.client.hello", {})
+        # Offer codecs to the host, it replies with the chosen one.
+        self.send_packet("connection.client.hello", {"codecs": self.codecs})
 
         self.handler: Callable[[str, dict], None] | None = None
 
@@ -29,6 +31,9 @@ class ClientToHostConnection(Connection):
 
     @override
     def onerror(self):
+        if self.errored:
+            return
+        super().onerror()
         self.handler("session.closed", {})
 
     @override
@@ -40,6 +45,7 @@ class ClientToHostConnection(Connection):
                 raise ConnectionError("Got host hello twice.")
             self.established = True
             self.client_id = data["id"]
+            self.set_codec(data.get("codec", "none"))
             self.handler("connection.established", {})
         else:
             if self.established:
@@ -1,71 +1,151 @@
 """Base connection class."""
 
-import gzip
 import json
 import logging
 import socket
 import struct
+import time
 import traceback
 from abc import abstractmethod
+from collections.abc import Sequence
+
+from labyrinths.compression import NONE, Codec, CodecStats, get_codec, get_codec_by_id
 
 logger = logging.getLogger(__name__)
 
+# Codecs offered by clients, most preferred first. The host picks the first one it allows too.
+DEFAULT_CODECS = ("zlib-1", "gzip", "none")
+# Payloads smaller than this are sent uncompressed.
+MIN_COMPRESSED_SIZE = 256
+# Frames larger than this are rejected, the length prefix can't be trusted then.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# How much is read from the socket at once.
+RECV_SIZE = 256 * 1024
+
+# Length prefix of every frame.
+FRAME_HEADER = struct.Struct("!I")
+
 
 class Connection:
     """Base connection class. Hold common functionality."""
 
-    def __init__(self, sock: socket.socket):
+    def __init__(self, sock: socket.socket, codecs: Sequence[str] = DEFAULT_CODECS):
         self.sock = sock
         self.sock.setblocking(False)
-        self.current_packet: bytes | None = None
-        self.current_packet_length: int = 0
+        # Every frame starts with the id of its codec, so this only affects what we send.
+        self.codecs = [get_codec(name).name for name in codecs]
+        self.codec: Codec = NONE
+        self.sent_stats: dict[str, CodecStats] = {}
+        self.received_stats: dict[str, CodecStats] = {}
+        # Received data not handled yet, starts at a frame boundary.
+        self.receive_buffer = bytearray()
+        self.recv_chunk = bytearray(RECV_SIZE)
+        # Framed data the socket hasn't accepted yet, it is non-blocking and may take only a part of a frame.
+        self.send_buffer = bytearray()
         self.errored = False
 
+    def set_codec(self, name: str) -> None:
+        """Compress packets sent from now on with given codec."""
+        self.codec = get_codec(name)
+
+    def _decode_frame(self, packet: bytes) -> bytes:
+        codec = get_codec_by_id(packet[0])
+        start = time.perf_counter()
+        raw = codec.decompress(packet[1:])
+        stats = self.received_stats.setdefault(codec.name, CodecStats(codec.name))
+        stats.raw_bytes += len(raw)
+        stats.compressed_bytes += len(packet) - 1
+        stats.decompress_seconds += time.perf_counter() - start
+        return raw
+
+    def _encode_frame(self, raw: bytes) -> bytes:
+        codec = self.codec if len(raw) >= MIN_COMPRESSED_SIZE else NONE
+        start = time.perf_counter()
+        compressed = codec.compress(raw)
+        stats = self.sent_stats.setdefault(codec.name, CodecStats(codec.name))
+        stats.raw_bytes += len(raw)
+        stats.compressed_bytes += len(compressed)
+        stats.compress_seconds += time.perf_counter() - start
+        return bytes([codec.id]) + compressed
+
     def _handle_packet(self, packet: bytes):
+        raw = b""
         try:
-            self.handle_packet(json.loads(gzip.decompress(packet).decode()))
+            raw = self._decode_frame(packet)
+            self.handle_packet(json.loads(raw.decode()))
         except Exception:
-            logger.debug(
-                f"Exception while handling packet: {gzip.decompress(packet).decode()}\n{traceback.format_exc()}"
-            )
+            logger.debug(f"Exception while handling packet: {raw!r}\n{traceback.format_exc()}")
             self.onerror()
 
     def handle_packet(self, raw_data: dict):
         ptype, data = raw_data["t"], raw_data["d"]
-        if ptype not in ("game.new", "game.sync_info"):
+        if ptype not in ("game.new", "game.sync_info", "game.maze"):
             logger.debug(f"Received packet: {ptype}: {data} ")
         self.do_handle_packet(ptype, data)
 
     def _send_packet(self, packet: bytes):
-        self.sock.send(struct.pack("!I", len(packet)) + packet)
+        if len(packet) > MAX_FRAME_SIZE:
+            raise ValueError(f"Packet of {len(packet)} bytes exceeds maximum frame size")
+        self.send_buffer += FRAME_HEADER.pack(len(packet))
+        self.send_buffer += packet
+        self._flush()
+
+    def _flush(self):
+        """Send as much of the send buffer as the socket takes now, the rest goes on the next update."""
+        while self.send_buffer:
+            try:
+                sent = self.sock.send(self.send_buffer)
+            except BlockingIOError:
+                return
+            del self.send_buffer[:sent]
 
     def send_packet(self, ptype: str, data: dict):
-        if ptype not in ("game.new", "game.sync_info"):
+        if ptype not in ("game.new", "game.sync_info", "game.maze"):
             logger.debug(f"Sending packet: {ptype}: {data}")
-        self._send_packet(gzip.compress(json.dumps({"t": ptype, "d": data}).encode()))
+        self._send_packet(self._encode_frame(json.dumps({"t": ptype, "d": data}).encode()))
 
     def onerror(self):
         self.errored = True
 
     def update(self):
+        try:
+            self._flush()
+        except Exception:
+            logger.debug(f"Exception while sending (low-level)\n{traceback.format_exc()}")
+            self.onerror()
         while not self.errored:
             try:
-                self._handle_packet_part()
+                self._receive()
             except BlockingIOError:
                 break
             except Exception:
                 logger.debug(f"Exception while handling packet (low-level)\n{traceback.format_exc()}")
                 self.onerror()
 
-    def _handle_packet_part(self):
-        if self.current_packet is None:
-            self.current_packet_length = struct.unpack("!I", self.sock.recv(4))[0]
-            self.current_packet = b""
-        self.current_packet += self.sock.recv(self.current_packet_length - len(self.current_packet))
-        if self.current_packet_length == len(self.current_packet):
-            packet = self.current_packet
-            self.current_packet = None
+    def _receive(self):
+        """Read a chunk from the socket and handle all frames completed by it."""
+        count = self.sock.recv_into(self.recv_chunk)
+        if not count:
+            raise ConnectionError("Connection closed by peer")
+        with memoryview(self.recv_chunk) as chunk:
+            self.receive_buffer += chunk[:count]
+        self._handle_frames()
+
+    def _handle_frames(self):
+        received = self.receive_buffer
+        start = 0
+        while not self.errored and len(received) - start >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(received, start)
+            if length > MAX_FRAME_SIZE:
+                raise ConnectionError(f"Frame of {length} bytes exceeds maximum frame size")
+            end = start + FRAME_HEADER.size + length
+            if len(received) < end:
+                break
+            packet = bytes(received[start + FRAME_HEADER.size : end])
+            start = end
             self._handle_packet(packet)
+        # Drop handled frames at once, so that the rest is moved only once per chunk.
+        del received[:start]
 
     @abstractmethod
     def do_handle_packet(self, ptype: str, data: dict) -> None: ...
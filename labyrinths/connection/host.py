@@ -5,21 +5,24 @@ from __future__ import annotations
 import logging
 import socket
 import traceback
+from collections.abc import Sequence
 from typing import Callable
 
 from typing_extensions import override
 
-from labyrinths.connection.connection import Connection
+from labyrinths.connection.connection import DEFAULT_CODECS, Connection
 
 
 class HostConnectionSet:
     """Stores list of host-to-client connections."""
 
-    def __init__(self, addr: str, port: int):
+    def __init__(self, addr: str, port: int, codecs: Sequence[str] = DEFAULT_CODECS):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.sock.bind((addr, port))
         self.sock.setblocking(False)
         self.sock.listen(0)
+        # Codecs clients may choose from.
+        self.codecs = codecs
 
         self.connections: dict[int, HostToClientConnection] = {}
         self._next_client_id = 1
@@ -58,7 +61,7 @@ class HostToClientConnection(Connection):
     """Connection from host to client."""
 
     def __init__(self, sock: socket.socket, conn_set: HostConnectionSet, client_id: int):
-        super().__init__(sock)
+        super().__init__(sock, conn_set.codecs)
         self.conn_set = conn_set
         self.established = False
         self.client_id = client_id
@@ -77,7 +80,9 @@ class HostToClientConnection(Connection):
             if self.established:
                 raise ConnectionError("Got client hello twice")
 
-            self.send_packet("connection.host.hello", {"id": self.client_id})
+            codec = next((name for name in data.get("codecs", []) if name in self.codecs), "none")
+            self.send_packet("connection.host.hello", {"id": self.client_id, "codec": codec})
+            self.set_codec(codec)
             self.established = True
         else:
             if self.established:
@@ -1,30 +1,67 @@
 """Defines the Game class."""
 
 import logging
-from typing import Tuple
+import random
+from typing import Any, Tuple
 
-from labyrinths.generators.dfs import DepthFirstSearchGenerator
-from labyrinths.generators.kruskal import KruskalGenerator
-from labyrinths.maze import MazeData, WallKind
+from labyrinths.generators.registry import get_generator_class
+from labyrinths.maze import MazeData
 from labyrinths.session.types import Player
+from labyrinths.solver import DistanceField
 
 logger = logging.getLogger(__name__)
 
 
+def maze_from_spec(spec: dict[str, Any]) -> MazeData | None:
+    """Regenerate the maze described by `Game.spec`. Return None if it can't be reproduced here."""
+    try:
+        genclass = get_generator_class(spec["algo"])
+    except ValueError:
+        return None
+    if genclass.version != spec["version"]:
+        return None
+    maze = genclass(spec["w"], spec["h"], spec["seed"]).generate()
+    if maze.content_hash() != spec["hash"]:
+        logger.warning(f"Maze regenerated from {spec} has a different hash")
+        return None
+    return maze
+
+
 class Game:
     """Handles the game logic."""
 
-    def __init__(self, w: int, h: int, algo: str):
-        genclass: type
-        match algo:
-            case "kruskal":
-                genclass = KruskalGenerator
-            case "dfs":
-                genclass = DepthFirstSearchGenerator
-            case _:
-                raise ValueError(f"Unknown algo {algo}")
-        gen = genclass(w, h)
-        self.maze: MazeData = gen.generate()
+    def __init__(
+        self,
+        w: int,
+        h: int,
+        algo: str,
+        seed: int | None = None,
+        maze: MazeData | None = None,
+        distances: DistanceField | None = None,
+    ):
+        """Generate a new game. `maze` can be passed if it was already generated with given `seed`.
+
+        `distances` can be passed if they were already computed for the maze, e.g. by `MazePool` workers.
+        """
+        genclass = get_generator_class(algo)
+        self.algo = algo
+        # The maze is identified by (algo, w, h, seed).
+        self.seed: int = random.getrandbits(32) if seed is None else seed
+        if maze is None:
+            maze = genclass(w, h, self.seed).generate()
+        elif seed is None:
+            raise ValueError("Pre-generated maze requires its seed")
+        self.maze: MazeData = maze
+        self.spec: dict[str, Any] = {
+            "algo": algo,
+            "w": w,
+            "h": h,
+            "seed": self.seed,
+            "version": genclass.version,
+            "hash": self.maze.content_hash(),
+        }
+        # Distances to the exit for hints and rankings, computed once per maze.
+        self.distances = distances if distances is not None else DistanceField(self.maze)
         self.players: dict[int, Player] = {}
         self.winner_id: int | None = None
         self.ended = False
@@ -43,7 +80,7 @@ class Game:
                 dx, dy = 1, 0
             case _:
                 raise ValueError(f"Invalid direction: {direction}")
-        if self.maze.field[x][y].get_wall_at(dx, dy) == WallKind.WALL:
+        if self.maze.has_wall(x, y, dx, dy):
             return None
 
         player.x += dx
@@ -53,3 +90,12 @@ class Game:
             self.winner_id = client_id
 
         return player.x, player.y
+
+    def hint(self, client_id: int) -> Tuple[int, int] | None:
+        """The next cell on the way to the exit for given player."""
+        player = self.players[client_id]
+        return self.distances.next_step(player.x, player.y)
+
+    def ranking(self) -> list[tuple[int, int | None]]:
+        """(id, distance to the exit) of all players, closest first."""
+        return self.distances.rank({client_id: (player.x, player.y) for client_id, player in self.players.items()})
@@ -0,0 +1,168 @@
+"""Pool of pre-generated mazes, so that the host doesn't generate them while clients wait."""
+
+import functools
+import logging
+import multiprocessing
+import random
+import threading
+from collections import OrderedDict
+from concurrent import futures
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from labyrinths.generators.difficulty import DifficultyConstraints, find_maze
+from labyrinths.generators.registry import get_generator_class
+from labyrinths.maze import MazeData
+from labyrinths.mazeloader import decode_maze, encode_maze
+from labyrinths.solver import DistanceField
+
+logger = logging.getLogger(__name__)
+
+# (algo, columns, rows)
+PoolKey = tuple[str, int, int]
+# (seed, maze, distance field)
+ReadyMaze = tuple[int, MazeData, DistanceField]
+
+
+def _pack(maze: MazeData) -> tuple[bytes, bytes]:
+    # Packed binary is much cheaper to send back than pickled objects. The distance field is a full search of the
+    # maze, so it is computed here too rather than in the host's packet handler.
+    return encode_maze(maze, compress=False), DistanceField(maze).to_bytes()
+
+
+def _unpack(seed: int, data: bytes, field: bytes) -> ReadyMaze:
+    maze = decode_maze(data)
+    return seed, maze, DistanceField.from_bytes(field, maze)
+
+
+def _generate(key: PoolKey, seed: int) -> tuple[bytes, bytes]:
+    algo, columns, rows = key
+    return _pack(get_generator_class(algo)(columns, rows, seed).generate())
+
+
+def _find(
+    key: PoolKey, constraints: DifficultyConstraints, deadline: float, seed: int | None
+) -> tuple[int, bytes, bytes]:
+    algo, columns, rows = key
+    # Searches run side by side with pool refills, a single process each.
+    found_seed, maze = find_maze(columns, rows, algo, constraints, deadline, jobs=1, seed=seed)
+    return found_seed, *_pack(maze)
+
+
+class MazePool:
+    """Keeps ready mazes for recently requested sizes and algorithms, generated by worker processes.
+
+    Up to `per_key` mazes are kept for each of the `max_keys` most recently requested keys. Ready and pending mazes
+    never take more than `max_cells` cells in total. Each maze comes with its distance field, about 9 bytes per cell.
+    """
+
+    def __init__(self, jobs: int | None = None, per_key: int = 2, max_keys: int = 4, max_cells: int = 4_000_000):
+        self.jobs = jobs
+        self.per_key = per_key
+        self.max_keys = max_keys
+        self.max_cells = max_cells
+
+        self.ready: OrderedDict[PoolKey, list[tuple[int, bytes, bytes]]] = OrderedDict()
+        self.pending: dict[PoolKey, int] = {}
+        self.futures: set[Future] = set()
+        # Reentrant: a done callback runs right away in the submitting thread if the future is already done.
+        self.lock = threading.RLock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Host runs next to UI and network threads, forking those is not safe.
+            self._executor = ProcessPoolExecutor(self.jobs, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _cells(self) -> int:
+        return sum(
+            key[1] * key[2] * (len(self.ready.get(key, [])) + self.pending.get(key, 0))
+            for key in self.ready.keys() | self.pending.keys()
+        )
+
+    def take(self, algo: str, columns: int, rows: int) -> ReadyMaze | None:
+        """Take a ready maze with its seed and distance field, if there is one. Either way, schedule a refill."""
+        get_generator_class(algo)  # Fail early on unknown algo.
+        key = (algo, columns, rows)
+        with self.lock:
+            ready = self.ready.setdefault(key, [])
+            self.ready.move_to_end(key)
+            while len(self.ready) > self.max_keys:
+                self.ready.popitem(last=False)
+            taken = ready.pop(0) if ready else None
+            self._refill(key)
+        if taken is None:
+            return None
+        return _unpack(*taken)
+
+    def find(
+        self,
+        algo: str,
+        columns: int,
+        rows: int,
+        constraints: DifficultyConstraints,
+        deadline: float,
+        seed: int | None = None,
+    ) -> "Future[ReadyMaze]":
+        """Search for a maze meeting `constraints` in a worker process, without blocking the caller.
+
+        The returned future resolves to the maze with its seed and distance field, or raises TimeoutError after
+        `deadline` seconds.
+        """
+        get_generator_class(algo)  # Fail early on unknown algo.
+        result: Future[ReadyMaze] = Future()
+        search = self.executor.submit(_find, (algo, columns, rows), constraints, deadline, seed)
+
+        def on_done(search: Future) -> None:
+            if result.cancelled():
+                return
+            if search.cancelled():
+                result.cancel()
+            elif search.exception() is not None:
+                result.set_exception(search.exception())
+            else:
+                result.set_result(_unpack(*search.result()))
+
+        search.add_done_callback(on_done)
+        # Don't keep a worker busy with a search nobody waits for.
+        result.add_done_callback(lambda result: result.cancelled() and search.cancel())
+        return result
+
+    def _refill(self, key: PoolKey) -> None:
+        cells = key[1] * key[2]
+        while (
+            len(self.ready[key]) + self.pending.get(key, 0) < self.per_key and self._cells() + cells <= self.max_cells
+        ):
+            seed = random.getrandbits(32)
+            future = self.executor.submit(_generate, key, seed)
+            self.pending[key] = self.pending.get(key, 0) + 1
+            self.futures.add(future)
+            future.add_done_callback(functools.partial(self._on_done, key, seed))
+
+    def _on_done(self, key: PoolKey, seed: int, future: Future) -> None:
+        with self.lock:
+            self.futures.discard(future)
+            self.pending[key] -= 1
+            if not self.pending[key]:
+                del self.pending[key]
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                logger.error(f"Failed to pre-generate maze {key}", exc_info=future.exception())
+                return
+            # The key may have been evicted while the maze was being generated.
+            if key in self.ready and len(self.ready[key]) < self.per_key:
+                self.ready[key].append((seed, *future.result()))
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait until all pending mazes are generated."""
+        with self.lock:
+            pending = list(self.futures)
+        futures.wait(pending, timeout)
+
+    def close(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,76 @@
+"""Generate many mazes at once, in parallel processes."""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from pathlib import Path
+
+from labyrinths.generators.registry import get_generator_class
+from labyrinths.mazearchive import ArchiveRow, MazeArchive, archive_row
+from labyrinths.mazeloader import BINARY_SUFFIX, dump_maze
+
+
+def _generate_one(task: tuple[str, int, int, int, str]) -> str:
+    algo, columns, rows, seed, path = task
+    dump_maze(get_generator_class(algo)(columns, rows, seed).generate(), path)
+    return path
+
+
+def generate_batch(
+    directory: PathLike | str,
+    count: int,
+    columns: int,
+    rows: int,
+    algo: str = "kruskal",
+    jobs: int | None = None,
+    seed: int | None = None,
+    suffix: str = BINARY_SUFFIX,
+) -> list[Path]:
+    """Generate `count` mazes with distinct seeds into `directory`, using `jobs` processes.
+
+    Files are named `{algo}-{columns}x{rows}-{seed}{suffix}`, so every maze can be regenerated from its name. `seed`
+    makes the whole batch reproducible.
+    """
+    get_generator_class(algo)  # Fail early on unknown algo.
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+
+    seeds = random.Random(seed).sample(range(2**32), count)
+    tasks = [(algo, columns, rows, s, str(target / f"{algo}-{columns}x{rows}-{s}{suffix}")) for s in seeds]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        paths = list(map(_generate_one, tasks))
+    else:
+        with ProcessPoolExecutor(jobs) as executor:
+            paths = list(executor.map(_generate_one, tasks, chunksize=max(1, count // (8 * jobs))))
+    return [Path(path) for path in paths]
+
+
+def _generate_row(task: tuple[str, int, int, int]) -> ArchiveRow:
+    algo, columns, rows, seed = task
+    return archive_row(get_generator_class(algo)(columns, rows, seed).generate(), algo, seed)
+
+
+def generate_archive(
+    path: PathLike | str,
+    count: int,
+    columns: int,
+    rows: int,
+    algo: str = "kruskal",
+    jobs: int | None = None,
+    seed: int | None = None,
+) -> int:
+    """Generate `count` mazes with distinct seeds into the archive at `path`, using `jobs` processes.
+
+    Return the number of mazes that were not in the archive yet.
+    """
+    get_generator_class(algo)  # Fail early on unknown algo.
+    seeds = random.Random(seed).sample(range(2**32), count)
+    tasks = [(algo, columns, rows, s) for s in seeds]
+    jobs = jobs or os.cpu_count() or 1
+    with MazeArchive(path) as archive:
+        if jobs == 1:
+            return archive.add_rows(map(_generate_row, tasks))
+        with ProcessPoolExecutor(jobs) as executor:
+            return archive.add_rows(executor.map(_generate_row, tasks, chunksize=max(1, count // (8 * jobs))))
@@ -1,37 +1,64 @@
 """Generate mazes using depth first search algorithm."""
 
 import random
+from array import array
+from collections.abc import Iterator
 
 from typing_extensions import override
 
 from labyrinths.generators.generator import MazeGenerator
-from labyrinths.maze import MazeData, WallKind
+from labyrinths.maze import ALL_WALLS, DOWN, LEFT, OPPOSITE_BITS, RIGHT, UP
 
 
 class DepthFirstSearchGenerator(MazeGenerator):
-    """Generate mazes using depth first search."""
+    """Generate mazes using depth first search.
 
-    def __init__(self, columns: int, rows: int):
-        super().__init__(columns, rows)
-        self.visited: list[list[bool]] | None = None
+    This is the recursive backtracker, but with an explicit stack of cell indices, so it isn't limited by the
+    recursion depth. A cell is unvisited while it still has all four walls, so there is no separate visited grid.
+    """
 
-    def visit(self, x: int, y: int) -> None:
-        """Visit cell."""
-        assert self.current
-        assert self.visited is not None
-        self.visited[x][y] = True
+    def __init__(self, columns: int, rows: int, seed: int | random.Random | None = None):
+        super().__init__(columns, rows, seed)
 
-        order = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        random.shuffle(order)
+    @override
+    def generate_steps(self, step_size: int = 1024) -> Iterator[None]:
+        """Generate maze, one step is one move of the search."""
+        self.check_step_size(step_size)
+        columns, rows = self.columns, self.rows
+        walls = self.current.walls
+        steps = ((LEFT, -rows), (RIGHT, rows), (UP, -1), (DOWN, 1))
+        options = [0, 0, 0, 0]
 
-        for dx, dy in order:
-            if not self.is_out_of_bounds(x + dx, y + dy) and not self.visited[x + dx][y + dy]:
-                self.set_wall_at(x, y, dx, dy, WallKind.EMPTY)
-                self.visit(x + dx, y + dy)
+        # The start cell is left with all walls only until the first move, which opens one of them.
+        start = (columns // 2) * rows + rows // 2
+        stack = array("i", [start])
+        budget = step_size
+        while stack:
+            budget -= 1
+            if not budget:
+                budget = step_size
+                yield
+            cell = stack[-1]
+            x, y = divmod(cell, rows)
+            count = 0
+            if x > 0 and walls[cell - rows] == ALL_WALLS:
+                options[count] = 0
+                count += 1
+            if x < columns - 1 and walls[cell + rows] == ALL_WALLS:
+                options[count] = 1
+                count += 1
+            if y > 0 and walls[cell - 1] == ALL_WALLS:
+                options[count] = 2
+                count += 1
+            if y < rows - 1 and walls[cell + 1] == ALL_WALLS:
+                options[count] = 3
+                count += 1
+            if not count:
+                stack.pop()
+                continue
 
-    @override
-    def generate(self) -> MazeData:
-        """Generate maze."""
-        self.visited = [[False for _ in range(self.rows)] for _ in range(self.columns)]
-        self.visit(self.columns // 2, self.rows // 2)
-        return self.current
+            bit, offset = steps[options[int(self.random.random() * count)]]
+            neighbour = cell + offset
+            walls[cell] &= ~bit
+            walls[neighbour] &= ~OPPOSITE_BITS[bit]
+            stack.append(neighbour)
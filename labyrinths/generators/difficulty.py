@@ -0,0 +1,144 @@
+"""Generate mazes matching difficulty constraints by trying many seeds in parallel."""
+
+import multiprocessing
+import os
+import random
+import time
+from array import array
+from collections import deque
+from concurrent import futures
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any
+
+from labyrinths.generators.registry import get_generator_class
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, MazeData
+from labyrinths.mazeloader import decode_maze, encode_maze
+from labyrinths.solver import closed_walls
+
+# Whether a cell with given wall bits has exactly one opening.
+IS_DEAD_END = bytes(bin(bits).count("1") == 3 for bits in range(16))
+
+
+@dataclass
+class MazeScore:
+    """Difficulty metrics of a maze."""
+
+    # Number of cells on the path from (0, 0) to (columns - 1, rows - 1), 0 if there is none.
+    solution_length: int
+    # Only cells reachable from (0, 0) are counted, which is all of them in a perfect maze.
+    dead_ends: int
+    dead_end_ratio: float
+
+
+@dataclass
+class DifficultyConstraints:
+    """Constraints on a maze, None means unconstrained."""
+
+    min_solution_length: int | None = None
+    min_dead_end_ratio: float | None = None
+    max_dead_end_ratio: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "DifficultyConstraints":
+        """Build constraints from untrusted packet data. Raise ValueError on unknown keys or invalid values."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Constraints must be a dict, got {data!r}")
+        known = {field.name for field in fields(cls)}
+        if unknown := data.keys() - known:
+            raise ValueError(f"Unknown constraints: {sorted(map(str, unknown))}")
+        for key, value in data.items():
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int | float):
+                raise ValueError(f"Constraint {key} must be a number, got {value!r}")
+            if key == "min_solution_length" and (not isinstance(value, int) or value < 0):
+                raise ValueError(f"Constraint {key} must be a non-negative integer, got {value!r}")
+            if key.endswith("_ratio") and not 0 <= value <= 1:
+                raise ValueError(f"Constraint {key} must be between 0 and 1, got {value!r}")
+        return cls(**data)
+
+    def accepts(self, score: MazeScore) -> bool:
+        """Check if a maze with given score meets the constraints."""
+        return (
+            (self.min_solution_length is None or score.solution_length >= self.min_solution_length)
+            and (self.min_dead_end_ratio is None or score.dead_end_ratio >= self.min_dead_end_ratio)
+            and (self.max_dead_end_ratio is None or score.dead_end_ratio <= self.max_dead_end_ratio)
+        )
+
+
+def score_maze(maze: MazeData) -> MazeScore:
+    """Score a maze in one linear pass: BFS distances from the start plus counting dead ends.
+
+    Open walls on the outer border are treated as closed, like the solver does.
+    """
+    walls = closed_walls(maze)
+    rows = maze.rows
+    cells = maze.columns * rows
+    dead_ends = 0
+
+    distance = array("i", [-1]) * cells
+    distance[0] = 0
+    queue = deque([0])
+    while queue:
+        cell = queue.popleft()
+        bits = walls[cell]
+        dead_ends += IS_DEAD_END[bits]
+        step = distance[cell] + 1
+        for bit, offset in ((LEFT, -rows), (RIGHT, rows), (UP, -1), (DOWN, 1)):
+            if not bits & bit and distance[cell + offset] < 0:
+                distance[cell + offset] = step
+                queue.append(cell + offset)
+
+    return MazeScore(distance[cells - 1] + 1, dead_ends, dead_ends / cells)
+
+
+def _candidate(
+    algo: str, columns: int, rows: int, seed: int, constraints: DifficultyConstraints
+) -> tuple[int, bytes | None]:
+    maze = get_generator_class(algo)(columns, rows, seed).generate()
+    return seed, encode_maze(maze, compress=False) if constraints.accepts(score_maze(maze)) else None
+
+
+def find_maze(
+    columns: int,
+    rows: int,
+    algo: str,
+    constraints: DifficultyConstraints,
+    deadline: float = 5.0,
+    jobs: int | None = None,
+    seed: int | None = None,
+) -> tuple[int, MazeData]:
+    """Generate candidates until one meets the constraints, return it with its seed.
+
+    Candidates are generated in `jobs` processes. Raise TimeoutError if nothing is found in `deadline` seconds.
+    """
+    get_generator_class(algo)  # Fail early on unknown algo.
+    seeds = random.Random(seed)
+    stop_at = time.monotonic() + deadline
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1:
+        while time.monotonic() < stop_at:
+            candidate_seed, data = _candidate(algo, columns, rows, seeds.getrandbits(32), constraints)
+            if data is not None:
+                return candidate_seed, decode_maze(data)
+        raise TimeoutError(f"No maze matching {constraints} in {deadline}s")
+
+    executor = ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        running: set[Future] = set()
+        while True:
+            while len(running) < jobs:
+                running.add(executor.submit(_candidate, algo, columns, rows, seeds.getrandbits(32), constraints))
+            done, running = futures.wait(
+                running, timeout=max(0.0, stop_at - time.monotonic()), return_when=futures.FIRST_COMPLETED
+            )
+            for future in done:
+                candidate_seed, data = future.result()
+                if data is not None:
+                    return candidate_seed, decode_maze(data)
+            if time.monotonic() >= stop_at:
+                raise TimeoutError(f"No maze matching {constraints} in {deadline}s")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
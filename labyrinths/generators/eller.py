@@ -0,0 +1,96 @@
+"""Generate mazes using Eller's algorithm."""
+
+import random
+from collections.abc import Iterator
+
+from typing_extensions import override
+
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.maze import ALL_WALLS, DOWN, LEFT, RIGHT, UP
+
+
+class EllerGenerator(MazeGenerator):
+    """Generate mazes using Eller's algorithm.
+
+    The maze is built one column at a time (columns are contiguous in MazeField), keeping only set membership of
+    the current column. `generate_columns` streams finished columns without ever allocating the whole grid, e.g.
+    into `mazeloader.dump_maze_stream`.
+    """
+
+    join_probability = 0.5
+
+    def __init__(self, columns: int, rows: int, seed: int | random.Random | None = None) -> None:
+        super().__init__(columns, rows, seed)
+
+    def generate_columns(self) -> Iterator[bytes]:
+        """Generate maze column by column, yielding wall bits of each finished column."""
+        rows = self.rows
+        # Set of every cell of the current column, labels are below 2 * rows.
+        labels = list(range(rows))
+        left_open = bytearray(rows)
+
+        for x in range(self.columns):
+            last = x == self.columns - 1
+            column = bytearray([ALL_WALLS]) * rows
+            for y in range(rows):
+                if left_open[y]:
+                    column[y] &= ~LEFT
+
+            parent = list(range(2 * rows))
+
+            def find(label: int) -> int:
+                while parent[label] != label:
+                    parent[label] = parent[parent[label]]
+                    label = parent[label]
+                return label
+
+            # Join vertically adjacent cells of different sets. The last column must join everything.
+            for y in range(rows - 1):
+                a, b = find(labels[y]), find(labels[y + 1])
+                if a != b and (last or self.random.random() < self.join_probability):
+                    parent[a] = b
+                    column[y] &= ~DOWN
+                    column[y + 1] &= ~UP
+
+            if last:
+                yield bytes(column)
+                return
+
+            # Every set continues into the next column through at least one passage.
+            groups: dict[int, list[int]] = {}
+            for y in range(rows):
+                groups.setdefault(find(labels[y]), []).append(y)
+            right_open = bytearray(rows)
+            for cells in groups.values():
+                opened = False
+                for y in cells:
+                    if self.random.random() < self.join_probability:
+                        right_open[y] = 1
+                        opened = True
+                if not opened:
+                    right_open[self.random.choice(cells)] = 1
+
+            # Relabel the next column: continued cells keep their set, the rest get fresh ones.
+            renamed: dict[int, int] = {}
+            next_labels = []
+            for y in range(rows):
+                if right_open[y]:
+                    column[y] &= ~RIGHT
+                    label = renamed.setdefault(find(labels[y]), len(renamed))
+                else:
+                    label = rows + y
+                next_labels.append(label)
+            labels = next_labels
+            left_open = right_open
+
+            yield bytes(column)
+
+    @override
+    def generate_steps(self, step_size: int = 1024) -> Iterator[None]:
+        """Generate maze, one step is one column regardless of `step_size`."""
+        self.check_step_size(step_size)
+        walls = self.current.walls
+        rows = self.rows
+        for x, column in enumerate(self.generate_columns()):
+            walls[x * rows : (x + 1) * rows] = column
+            yield
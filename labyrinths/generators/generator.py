@@ -1,74 +1,78 @@
 """Module with base class for generators."""
 
-from labyrinths.maze import Cell, CellKind, MazeData, WallKind
+import random
+from collections.abc import Iterator
+
+from labyrinths.maze import ALL_WALLS, DIRECTION_BITS, OPPOSITE_BITS, MazeData, MazeField, WallKind
 
 
 class MazeGenerator:
     """Basic class for generating mazes."""
 
-    def __init__(self, columns: int, rows: int) -> None:
+    # Bump whenever the same seed starts producing a different maze.
+    version = 1
+
+    def __init__(self, columns: int, rows: int, seed: int | random.Random | None = None) -> None:
         self.columns = columns
         self.rows = rows
-        self.current: MazeData = self.get_filled_maze(columns, rows)
+        # Every generator owns its RNG, so (algo, columns, rows, seed) identifies a maze.
+        if isinstance(seed, random.Random):
+            self.seed: int | None = None
+            self.random = seed
+        else:
+            self.seed = seed
+            self.random = random.Random(seed)
+        self._current: MazeData | None = None
+
+    @property
+    def current(self) -> MazeData:
+        """Maze being generated. Allocated on first use, so that streaming generators never hold the whole grid."""
+        if self._current is None:
+            self._current = self.get_filled_maze(self.columns, self.rows)
+        return self._current
 
     @classmethod
     def get_empty_maze(cls, columns: int, rows: int) -> MazeData:
         """Gen dummy maze without any walls."""
-        data = MazeData(
-            columns,
-            rows,
-            [
-                [
-                    Cell(
-                        kind=CellKind.EMPTY,
-                        left=WallKind.EMPTY,
-                        right=WallKind.EMPTY,
-                        up=WallKind.EMPTY,
-                        down=WallKind.EMPTY,
-                    )
-                    for _ in range(rows)
-                ]
-                for _ in range(columns)
-            ],
-        )
-        for x in range(columns):
-            data.field[x][0].up = WallKind.WALL
-            data.field[x][rows - 1].down = WallKind.WALL
-        for y in range(rows):
-            data.field[0][y].left = WallKind.WALL
-            data.field[columns - 1][y].right = WallKind.WALL
-        return data
+        return MazeData(columns, rows, MazeField.bordered(columns, rows))
 
     @classmethod
     def get_filled_maze(cls, columns: int, rows: int) -> MazeData:
         """Get maze filled with walls."""
-        return MazeData(
-            columns,
-            rows,
-            [
-                [
-                    Cell(
-                        kind=CellKind.EMPTY,
-                        left=WallKind.WALL,
-                        right=WallKind.WALL,
-                        up=WallKind.WALL,
-                        down=WallKind.WALL,
-                    )
-                    for _ in range(rows)
-                ]
-                for _ in range(columns)
-            ],
-        )
+        return MazeData(columns, rows, MazeField.filled(columns, rows, ALL_WALLS))
 
-    def generate(self) -> MazeData:
-        """Generate maze, virtual function."""
+    def generate_steps(self, step_size: int = 1024) -> Iterator[None]:
+        """Generate maze into `current`, yielding after every `step_size` units of work. Virtual function.
+
+        Lets the caller interleave generation with other work, or draw `current` while it is being generated.
+        """
         raise NotImplementedError  # pragma: no cover
 
+    @staticmethod
+    def check_step_size(step_size: int) -> None:
+        """Raise ValueError if `step_size` is not a valid argument for `generate_steps`."""
+        if step_size < 1:
+            raise ValueError(f"step_size must be at least 1, got {step_size}")
+
+    def generate(self) -> MazeData:
+        """Generate maze."""
+        for _ in self.generate_steps():
+            pass
+        return self.current
+
     def is_out_of_bounds(self, x: int, y: int) -> bool:
         """Check if (x, y) is out of bounds."""
         return not (0 <= x < self.columns and 0 <= y < self.rows)
 
     def set_wall_at(self, x: int, y: int, dx: int, dy: int, wallkind: WallKind) -> None:
         """Set wall between (x, y) and (x + dx, y + dy)."""
-        self.current.field[x][y].set_wall_at(dx, dy, wallkind)
-        self.current.field[x + dx][y + dy].set_wall_at(-dx, -dy, wallkind)
+        bit = DIRECTION_BITS[(dx, dy)]
+        walls = self.current.walls
+        index = x * self.rows + y
+        other = index + dx * self.rows + dy
+        if wallkind is WallKind.WALL:
+            walls[index] |= bit
+            walls[other] |= OPPOSITE_BITS[bit]
+        else:
+            walls[index] &= ~bit
+            walls[other] &= ~OPPOSITE_BITS[bit]
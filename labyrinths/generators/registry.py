@@ -0,0 +1,22 @@
+"""Generators available by name."""
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.eller import EllerGenerator
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.generators.tiled import TiledGenerator
+
+GENERATORS: dict[str, type[MazeGenerator]] = {
+    "kruskal": KruskalGenerator,
+    "dfs": DepthFirstSearchGenerator,
+    "eller": EllerGenerator,
+    "tiled": TiledGenerator,
+}
+
+
+def get_generator_class(algo: str) -> type[MazeGenerator]:
+    """Get generator class by its name."""
+    try:
+        return GENERATORS[algo]
+    except KeyError:
+        raise ValueError(f"Unknown algo {algo}") from None
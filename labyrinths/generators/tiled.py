@@ -0,0 +1,107 @@
+"""Generate huge mazes tile by tile, optionally in worker processes."""
+
+import multiprocessing
+import random
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from typing_extensions import override
+
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import DisjointSetUnion, KruskalGenerator
+from labyrinths.maze import WallBuffer, WallKind
+
+# (x, y, columns, rows) of a tile.
+Tile = tuple[int, int, int, int]
+
+
+def _generate_tile(genclass: type[MazeGenerator], columns: int, rows: int, seed: int) -> bytes:
+    return bytes(genclass(columns, rows, seed).generate().walls)
+
+
+class TiledGenerator(MazeGenerator):
+    """Split the maze into tiles, generate each one with its own seed, then stitch them.
+
+    Every tile is a perfect maze on its own. Tiles are joined along a random spanning tree of the tile grid (built
+    with a DSU, like in Kruskal), opening exactly one seam wall per joined pair, so the result is a perfect maze too.
+    The result depends only on the seed, not on the number of processes.
+
+    Tiles are generated in-process unless `jobs` > 1 is passed, which starts a pool of spawned processes. Only
+    top-level callers should opt in: generators built from the registry run inside other workers and games.
+    """
+
+    # 2: Kruskal tiles changed.
+    version = 2
+
+    def __init__(
+        self,
+        columns: int,
+        rows: int,
+        seed: int | random.Random | None = None,
+        tile_size: int = 256,
+        tile_generator: type[MazeGenerator] = KruskalGenerator,
+        jobs: int = 1,
+    ) -> None:
+        super().__init__(columns, rows, seed)
+        self.tile_size = tile_size
+        self.tile_generator = tile_generator
+        self.jobs = jobs
+
+    def _tiles(self) -> list[Tile]:
+        return [
+            (x, y, min(self.tile_size, self.columns - x), min(self.tile_size, self.rows - y))
+            for x in range(0, self.columns, self.tile_size)
+            for y in range(0, self.rows, self.tile_size)
+        ]
+
+    def _place(self, tile: Tile, tile_walls: bytes | WallBuffer) -> None:
+        x, y, columns, rows = tile
+        walls = self.current.walls
+        for column in range(columns):
+            start = (x + column) * self.rows + y
+            walls[start : start + rows] = tile_walls[column * rows : (column + 1) * rows]
+
+    def _stitch(self, tiles: list[Tile]) -> None:
+        tiles_x = len(range(0, self.columns, self.tile_size))
+        tiles_y = len(range(0, self.rows, self.tile_size))
+        # Tile (i, j) has index i * tiles_y + j, same as in _tiles.
+        seams = [(i, j, 1, 0) for i in range(tiles_x - 1) for j in range(tiles_y)]
+        seams += [(i, j, 0, 1) for i in range(tiles_x) for j in range(tiles_y - 1)]
+        self.random.shuffle(seams)
+
+        dsu = DisjointSetUnion(len(tiles))
+        for i, j, dx, dy in seams:
+            if not dsu.union(i * tiles_y + j, (i + dx) * tiles_y + j + dy):
+                continue
+            x, y, columns, rows = tiles[i * tiles_y + j]
+            if dx:
+                self.set_wall_at(x + columns - 1, y + self.random.randrange(rows), 1, 0, WallKind.EMPTY)
+            else:
+                self.set_wall_at(x + self.random.randrange(columns), y + rows - 1, 0, 1, WallKind.EMPTY)
+
+    @override
+    def generate_steps(self, step_size: int = 1024) -> Iterator[None]:
+        """Generate maze. With several jobs one step is one tile, otherwise steps are the tile generator's."""
+        self.check_step_size(step_size)
+        tiles = self._tiles()
+        seeds = [self.random.getrandbits(64) for _ in tiles]
+
+        if self.jobs <= 1 or len(tiles) == 1:
+            for tile, seed in zip(tiles, seeds):
+                gen = self.tile_generator(tile[2], tile[3], seed)
+                yield from gen.generate_steps(step_size)
+                self._place(tile, gen.current.walls)
+        else:
+            with ProcessPoolExecutor(self.jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = executor.map(
+                    _generate_tile,
+                    [self.tile_generator] * len(tiles),
+                    [tile[2] for tile in tiles],
+                    [tile[3] for tile in tiles],
+                    seeds,
+                )
+                for tile, tile_walls in zip(tiles, results):
+                    self._place(tile, tile_walls)
+                    yield
+
+        self._stitch(tiles)
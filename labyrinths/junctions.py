@@ -0,0 +1,168 @@
+"""Junction graph of a maze.
+
+Most cells of a perfect maze are corridor cells with exactly two openings. `JunctionGraph` keeps only junctions and
+dead ends as nodes and contracts corridors between them into weighted edges that remember their cells, so searches
+run on a much smaller graph and paths are expanded back to cells at the end.
+"""
+
+import heapq
+from array import array
+
+from labyrinths.maze import ALL_WALLS, DOWN, LEFT, RIGHT, UP, MazeData
+from labyrinths.solver import NoSolution, Solution, closed_walls
+
+# Number of openings of a cell by its wall bits.
+OPENINGS = bytes(4 - bin(bits & ALL_WALLS).count("1") for bits in range(256))
+
+
+class JunctionGraph:
+    """Maze contracted into junctions, dead ends and corridors between them.
+
+    Cells are addressed by their index in maze walls. Edge `i` is `edges[i] = (a, b, cells)`: node indices of its
+    ends and the corridor cells from `a` to `b`, its weight is `len(cells) + 1`.
+    """
+
+    def __init__(self, maze: MazeData) -> None:
+        self.columns, self.rows = maze.columns, maze.rows
+        self.walls = walls = closed_walls(maze)
+        self.steps = ((LEFT, -maze.rows), (RIGHT, maze.rows), (UP, -1), (DOWN, 1))
+        openings = walls.translate(OPENINGS)
+
+        self.nodes: list[int] = []
+        self.edges: list[tuple[int, int, array]] = []
+        self.adjacency: list[list[int]] = []
+        # Node index of node cells and edge index and position in the edge of corridor cells, -1 otherwise.
+        self.node_of = array("i", [-1]) * len(walls)
+        self.edge_of = array("i", [-1]) * len(walls)
+        self.position = array("i", [-1]) * len(walls)
+
+        for cell, count in enumerate(openings):
+            if count != 2:
+                self._add_node(cell)
+        for node in range(len(self.nodes)):
+            self._trace_from(node)
+        # Corridors that form loops without any junctions on them.
+        for cell, count in enumerate(openings):
+            if count == 2 and self.edge_of[cell] < 0 and self.node_of[cell] < 0:
+                self._trace_from(self._add_node(cell))
+
+    def _add_node(self, cell: int) -> int:
+        self.node_of[cell] = len(self.nodes)
+        self.nodes.append(cell)
+        self.adjacency.append([])
+        return len(self.nodes) - 1
+
+    def _trace_from(self, node: int) -> None:
+        walls, node_of, edge_of = self.walls, self.node_of, self.edge_of
+        start = self.nodes[node]
+        for bit, delta in self.steps:
+            if walls[start] & bit:
+                continue
+            previous, cell = start, start + delta
+            if edge_of[cell] >= 0 or node_of[cell] >= 0 and node_of[cell] < node:
+                # Traced already from the other end.
+                continue
+            edge = len(self.edges)
+            cells = array("i")
+            while node_of[cell] < 0:
+                edge_of[cell] = edge
+                self.position[cell] = len(cells)
+                cells.append(cell)
+                following = next(
+                    cell + step for wall, step in self.steps if not walls[cell] & wall and cell + step != previous
+                )
+                previous, cell = cell, following
+            self.edges.append((node, node_of[cell], cells))
+            self.adjacency[node].append(edge)
+            if node_of[cell] != node:
+                self.adjacency[node_of[cell]].append(edge)
+
+    def _exits(self, cell: int) -> list[tuple[int, int, int]]:
+        """(node, distance, side) for the nearest nodes of a cell. Side is -1 for a node, 0 or 1 for the end of the
+        corridor the cell lies in."""
+        if self.node_of[cell] >= 0:
+            return [(self.node_of[cell], 0, -1)]
+        a, b, cells = self.edges[self.edge_of[cell]]
+        position = self.position[cell]
+        return [(a, position + 1, 0), (b, len(cells) - position, 1)]
+
+    def _towards(self, cell: int, side: int) -> list[int]:
+        """Cells from a corridor cell (excluded) to the node at given side of the corridor (included)."""
+        a, b, cells = self.edges[self.edge_of[cell]]
+        position = self.position[cell]
+        if side == 0:
+            return [*reversed(cells[:position]), self.nodes[a]]
+        return [*cells[position + 1 :], self.nodes[b]]
+
+    def solve(self, begin: tuple[int, int], end: tuple[int, int]) -> Solution:
+        """Find a shortest path with Dijkstra's algorithm over the junctions."""
+        begin_id, end_id = begin[0] * self.rows + begin[1], end[0] * self.rows + end[1]
+        if begin_id == end_id:
+            return Solution([begin])
+
+        best, best_end = float("inf"), (-1, -1)
+        cells: list[int] = []
+        if self.edge_of[begin_id] >= 0 and self.edge_of[begin_id] == self.edge_of[end_id]:
+            # Straight along the corridor, unless there is a shorter way around.
+            i, j = self.position[begin_id], self.position[end_id]
+            corridor = self.edges[self.edge_of[begin_id]][2]
+            best, cells = abs(i - j), list(corridor[i : j + 1] if i < j else reversed(corridor[j : i + 1]))
+
+        targets: dict[int, list[tuple[int, int]]] = {}
+        for node, distance, side in self._exits(end_id):
+            targets.setdefault(node, []).append((distance, side))
+        distances: dict[int, int] = {}
+        # node: (previous node or -1 for begin, edge, edge goes forward or side of begin for the first node)
+        parents: dict[int, tuple[int, int, int]] = {}
+        heap: list[tuple[int, int]] = []
+        for node, distance, side in self._exits(begin_id):
+            if distance < distances.get(node, distance + 1):
+                distances[node] = distance
+                parents[node] = (-1, -1, side)
+                heapq.heappush(heap, (distance, node))
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance >= best:
+                break
+            if distance > distances[node]:
+                continue
+            for extra, side in targets.get(node, ()):
+                if distance + extra < best:
+                    best, best_end = distance + extra, (node, side)
+            for edge in self.adjacency[node]:
+                a, b, corridor = self.edges[edge]
+                for other, forward in ((b, 1), (a, 0)):
+                    if (a if forward else b) != node:
+                        continue
+                    new_distance = distance + len(corridor) + 1
+                    if new_distance < distances.get(other, new_distance + 1):
+                        distances[other] = new_distance
+                        parents[other] = (node, edge, forward)
+                        heapq.heappush(heap, (new_distance, other))
+
+        if best == float("inf"):
+            raise NoSolution
+        if best_end[0] >= 0:
+            cells = self._expand(begin_id, end_id, *best_end, parents)
+        return Solution([divmod(cell, self.rows) for cell in cells])
+
+    def _expand(
+        self, begin: int, end: int, node: int, side: int, parents: dict[int, tuple[int, int, int]]
+    ) -> list[int]:
+        """Expand the path found by `solve` back to cells."""
+        # Corridor from the last node to end.
+        tail = list(reversed(self._towards(end, side)[:-1])) + [end] if side >= 0 else []
+        chain = []
+        while parents[node][0] >= 0:
+            previous, edge, forward = parents[node]
+            chain.append((edge, forward, node))
+            node = previous
+        cells = [begin]
+        if parents[node][2] >= 0:
+            cells.extend(self._towards(begin, parents[node][2]))
+        for edge, forward, target in reversed(chain):
+            corridor = self.edges[edge][2]
+            cells.extend(corridor if forward else reversed(corridor))
+            cells.append(self.nodes[target])
+        cells.extend(tail)
+        return cells
@@ -1,6 +1,9 @@
 """Module containing classes related to labyrinth data."""
 
 import enum
+import hashlib
+import struct
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 
 
@@ -17,6 +20,28 @@ class WallKind(enum.Enum):
     WALL = 1
 
 
+# Wall bits of a cell as stored in MazeField.
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+ALL_WALLS = LEFT | RIGHT | UP | DOWN
+
+# Storage of wall bits. A memoryview is used for mazes mapped from files.
+WallBuffer = bytearray | memoryview
+
+DIRECTION_BITS: dict[tuple[int, int], int] = {(-1, 0): LEFT, (1, 0): RIGHT, (0, -1): UP, (0, 1): DOWN}
+OPPOSITE_BITS: dict[int, int] = {LEFT: RIGHT, RIGHT: LEFT, UP: DOWN, DOWN: UP}
+
+
+def wall_bit(dx: int, dy: int) -> int:
+    """Get the wall bit facing (dx, dy) direction."""
+    try:
+        return DIRECTION_BITS[(dx, dy)]
+    except KeyError:
+        raise ValueError(f"Invalid direction: {(dx, dy)}") from None
+
+
 @dataclass
 class Cell:
     """Cell data."""
@@ -55,6 +80,152 @@ class Cell:
             case _:  # pragma: no cover
                 raise Exception
 
+    def to_bits(self) -> int:
+        """Pack walls of the cell into a bitmask."""
+        return (
+            (LEFT if self.left is WallKind.WALL else 0)
+            | (RIGHT if self.right is WallKind.WALL else 0)
+            | (UP if self.up is WallKind.WALL else 0)
+            | (DOWN if self.down is WallKind.WALL else 0)
+        )
+
+
+def _wall_property(bit: int) -> property:
+    def getter(self: "CellView") -> WallKind:
+        return WallKind.WALL if self._walls[self._index] & bit else WallKind.EMPTY
+
+    def setter(self: "CellView", wallkind: WallKind) -> None:
+        if wallkind is WallKind.WALL:
+            self._walls[self._index] |= bit
+        else:
+            self._walls[self._index] &= ~bit
+
+    return property(getter, setter)
+
+
+class CellView(Cell):
+    """Cell stored inside a MazeField. Reads and writes go directly to its wall bits."""
+
+    __slots__ = ("_walls", "_index")
+
+    def __init__(self, walls: WallBuffer, index: int) -> None:
+        self._walls = walls
+        self._index = index
+
+    left = _wall_property(LEFT)  # type: ignore[assignment]
+    right = _wall_property(RIGHT)  # type: ignore[assignment]
+    up = _wall_property(UP)  # type: ignore[assignment]
+    down = _wall_property(DOWN)  # type: ignore[assignment]
+
+    @property  # type: ignore[misc]
+    def kind(self) -> CellKind:
+        return CellKind.EMPTY
+
+    @kind.setter
+    def kind(self, kind: CellKind) -> None:
+        if kind is not CellKind.EMPTY:  # pragma: no cover
+            raise ValueError(f"Unsupported cell kind: {kind}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Cell):
+            return NotImplemented
+        return self.kind is other.kind and self.to_bits() == other.to_bits()
+
+    def __repr__(self) -> str:
+        return f"CellView(left={self.left}, right={self.right}, up={self.up}, down={self.down})"
+
+    def to_bits(self) -> int:
+        return self._walls[self._index]
+
+
+class MazeColumn(Sequence[Cell]):
+    """One column of a MazeField."""
+
+    __slots__ = ("_walls", "_offset", "_rows")
+
+    def __init__(self, walls: WallBuffer, offset: int, rows: int) -> None:
+        self._walls = walls
+        self._offset = offset
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, y: int) -> Cell:  # type: ignore[override]
+        if y < 0:
+            y += self._rows
+        if not 0 <= y < self._rows:
+            raise IndexError("cell index out of range")
+        return CellView(self._walls, self._offset + y)
+
+    def __iter__(self) -> Iterator[Cell]:
+        for index in range(self._offset, self._offset + self._rows):
+            yield CellView(self._walls, index)
+
+
+class MazeField(Sequence[MazeColumn]):
+    """Grid of cells packed into one byte of wall bits per cell, column by column.
+
+    Cell (x, y) lives at index x * rows + y. field[x][y] returns a CellView, so code written for
+    list[list[Cell]] keeps working.
+    """
+
+    __slots__ = ("columns", "rows", "walls")
+
+    def __init__(self, columns: int, rows: int, walls: WallBuffer) -> None:
+        if len(walls) != columns * rows:
+            raise ValueError(f"Expected {columns * rows} cells, got {len(walls)}")
+        self.columns = columns
+        self.rows = rows
+        self.walls = walls
+
+    @classmethod
+    def filled(cls, columns: int, rows: int, bits: int) -> "MazeField":
+        """Create a field where every cell has the same walls."""
+        return cls(columns, rows, bytearray([bits]) * (columns * rows))
+
+    @classmethod
+    def bordered(cls, columns: int, rows: int) -> "MazeField":
+        """Create a field with walls only around its border."""
+        field = cls.filled(columns, rows, 0)
+        walls = field.walls
+        for x in range(columns):
+            walls[x * rows] |= UP
+            walls[x * rows + rows - 1] |= DOWN
+        for y in range(rows):
+            walls[y] |= LEFT
+            walls[(columns - 1) * rows + y] |= RIGHT
+        return field
+
+    @classmethod
+    def from_cells(cls, columns: int, rows: int, cells: Sequence[Sequence[Cell]]) -> "MazeField":
+        """Pack a list of columns of cells."""
+        if len(cells) != columns or any(len(column) != rows for column in cells):
+            raise ValueError(f"Expected {columns}x{rows} cells")
+        return cls(columns, rows, bytearray(cell.to_bits() for column in cells for cell in column))
+
+    def __len__(self) -> int:
+        return self.columns
+
+    def __getitem__(self, x: int) -> MazeColumn:  # type: ignore[override]
+        if x < 0:
+            x += self.columns
+        if not 0 <= x < self.columns:
+            raise IndexError("column index out of range")
+        return MazeColumn(self.walls, x * self.rows, self.rows)
+
+    def __iter__(self) -> Iterator[MazeColumn]:
+        for x in range(self.columns):
+            yield MazeColumn(self.walls, x * self.rows, self.rows)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MazeField):
+            return NotImplemented
+        return self.columns == other.columns and self.rows == other.rows and self.walls == other.walls
+
+    def __repr__(self) -> str:
+        return f"MazeField(columns={self.columns}, rows={self.rows})"
+
 
 @dataclass
 class MazeData:
@@ -63,4 +234,28 @@ class MazeData:
     columns: int
     rows: int
 
-    field: list[list[Cell]]
+    field: Sequence[Sequence[Cell]]
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.field, MazeField):
+            self.field = MazeField.from_cells(self.columns, self.rows, self.field)
+
+    @property
+    def walls(self) -> WallBuffer:
+        """Wall bits of all cells, see MazeField."""
+        assert isinstance(self.field, MazeField)
+        return self.field.walls
+
+    def content_hash(self) -> str:
+        """BLAKE2 hash of maze size and walls."""
+        digest = hashlib.blake2b(struct.pack("!II", self.columns, self.rows), digest_size=16)
+        digest.update(self.walls)
+        return digest.hexdigest()
+
+    def index(self, x: int, y: int) -> int:
+        """Get index of cell (x, y) in walls."""
+        return x * self.rows + y
+
+    def has_wall(self, x: int, y: int, dx: int, dy: int) -> bool:
+        """Check if the cell (x, y) has a wall facing (dx, dy) direction."""
+        return bool(self.walls[x * self.rows + y] & wall_bit(dx, dy))
@@ -0,0 +1,191 @@
+"""Archive of many mazes in one SQLite file.
+
+Mazes are stored in the binary format of `mazeloader` together with their metadata and are keyed by content hash, so
+adding the same maze twice keeps one copy. Loading by hash uses the primary key. Picking a random maze of given size
+and algorithm reads the rowids of that kind through the index once and then picks from them in constant time.
+"""
+
+import random
+import re
+import sqlite3
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from labyrinths.generators.difficulty import score_maze
+from labyrinths.maze import MazeData
+from labyrinths.mazeloader import decode_maze, encode_maze, load_maze
+
+ARCHIVE_SUFFIX = ".mazedb"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mazes (
+    hash TEXT PRIMARY KEY,
+    columns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    algo TEXT,
+    seed INTEGER,
+    solution_length INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mazes_by_kind ON mazes (columns, rows, algo);
+"""
+
+# Names given by `generate_batch`: {algo}-{columns}x{rows}-{seed}.
+_BATCH_NAME = re.compile(r"(?P<algo>\w+)-(?P<columns>\d+)x(?P<rows>\d+)-(?P<seed>\d+)")
+
+
+@dataclass
+class ArchiveEntry:
+    """Metadata of an archived maze."""
+
+    hash: str
+    columns: int
+    rows: int
+    algo: str | None
+    seed: int | None
+    # Number of cells on the path from (0, 0) to (columns - 1, rows - 1), 0 if there is none.
+    solution_length: int
+
+
+# hash, columns, rows, algo, seed, solution_length, data
+ArchiveRow = tuple[str, int, int, str | None, int | None, int, bytes]
+
+
+def archive_row(maze: MazeData, algo: str | None = None, seed: int | None = None) -> ArchiveRow:
+    """Row of the archive table for a maze. Scoring and encoding take most of the time of adding a maze, so rows can
+    be made in other processes."""
+    return (
+        maze.content_hash(),
+        maze.columns,
+        maze.rows,
+        algo,
+        seed,
+        score_maze(maze).solution_length,
+        encode_maze(maze),
+    )
+
+
+class MazeArchive:
+    """SQLite archive of mazes. Can be used as a context manager."""
+
+    def __init__(self, path: PathLike | str) -> None:
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(_SCHEMA)
+        # Rowids of mazes matching a `_where` clause, for `random`. Dropped when the archive changes.
+        self._rowids: dict[tuple[str, tuple], array] = {}
+        self._data_version: int | None = None
+
+    def __enter__(self) -> "MazeArchive":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM mazes").fetchone()[0]
+
+    def __contains__(self, maze_hash: object) -> bool:
+        return self.db.execute("SELECT 1 FROM mazes WHERE hash = ?", (maze_hash,)).fetchone() is not None
+
+    def add(self, maze: MazeData, algo: str | None = None, seed: int | None = None) -> bool:
+        """Add a maze. Return False if it is in the archive already."""
+        return self.add_many([(maze, algo, seed)]) == 1
+
+    def add_many(self, mazes: Iterable[tuple[MazeData, str | None, int | None]]) -> int:
+        """Add (maze, algo, seed) entries in one transaction. Return the number of new mazes."""
+        return self.add_rows(archive_row(maze, algo, seed) for maze, algo, seed in mazes)
+
+    def add_rows(self, rows: Iterable[ArchiveRow]) -> int:
+        """Add rows made by `archive_row` in one transaction. Return the number of new mazes."""
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO mazes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            added = self.db.total_changes - before
+        if added:
+            self._rowids.clear()
+        return added
+
+    def add_file(self, path: PathLike | str) -> bool:
+        """Add a maze file. Algorithm and seed are taken from names given by `generate_batch`."""
+        match = _BATCH_NAME.fullmatch(Path(path).name.split(".")[0])
+        algo, seed = (match["algo"], int(match["seed"])) if match else (None, None)
+        return self.add(load_maze(path), algo, seed)
+
+    def get(self, maze_hash: str) -> MazeData | None:
+        """Load a maze by its content hash."""
+        row = self.db.execute("SELECT data FROM mazes WHERE hash = ?", (maze_hash,)).fetchone()
+        return decode_maze(row[0]) if row is not None else None
+
+    def info(self, maze_hash: str) -> ArchiveEntry | None:
+        """Get metadata of a maze by its content hash."""
+        row = self.db.execute(
+            "SELECT hash, columns, rows, algo, seed, solution_length FROM mazes WHERE hash = ?", (maze_hash,)
+        ).fetchone()
+        return ArchiveEntry(*row) if row is not None else None
+
+    @staticmethod
+    def _where(columns: int | None, rows: int | None, algo: str | None) -> tuple[str, list]:
+        conditions, parameters = [], []
+        for name, value in (("columns", columns), ("rows", rows), ("algo", algo)):
+            if value is not None:
+                conditions.append(f"{name} = ?")
+                parameters.append(value)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def find(
+        self,
+        columns: int | None = None,
+        rows: int | None = None,
+        algo: str | None = None,
+        min_solution_length: int = 0,
+    ) -> list[ArchiveEntry]:
+        """Get metadata of all mazes matching given properties, None matches anything."""
+        where, parameters = self._where(columns, rows, algo)
+        where += " AND " if where else " WHERE "
+        return [
+            ArchiveEntry(*row)
+            for row in self.db.execute(
+                f"SELECT hash, columns, rows, algo, seed, solution_length FROM mazes{where}solution_length >= ?",
+                [*parameters, min_solution_length],
+            )
+        ]
+
+    def _kind_rowids(self, where: str, parameters: list) -> array:
+        # Other connections writing to the archive change data_version, our own writes clear the cache in add_rows.
+        data_version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._rowids.clear()
+            self._data_version = data_version
+        key = where, tuple(parameters)
+        if key not in self._rowids:
+            # Read through the (columns, rows, algo) index, which holds rowids too.
+            self._rowids[key] = array(
+                "q",
+                (rowid for (rowid,) in self.db.execute(f"SELECT rowid FROM mazes{where} ORDER BY rowid", parameters)),
+            )
+        return self._rowids[key]
+
+    def random(
+        self,
+        columns: int | None = None,
+        rows: int | None = None,
+        algo: str | None = None,
+        rng: random.Random | None = None,
+    ) -> tuple[ArchiveEntry, MazeData] | None:
+        """Pick a random maze with given properties, None matches anything. Return None if there is no such maze."""
+        rowids = self._kind_rowids(*self._where(columns, rows, algo))
+        if not rowids:
+            return None
+        rowid = rowids[(rng or random).randrange(len(rowids))]
+        *metadata, data = self.db.execute(
+            "SELECT hash, columns, rows, algo, seed, solution_length, data FROM mazes WHERE rowid = ?", (rowid,)
+        ).fetchone()
+        return ArchiveEntry(*metadata), decode_maze(data)
@@ -1,19 +1,305 @@
-"""Utility functions for loading and storing mazes in files."""
+"""Utility functions for loading and storing mazes in files.
 
-import gzip
+Two formats are supported. The JSON one is compressed `utils.dump` output, usually `.json.gz`. The binary one
+(`.maze`) is a header followed by wall bits of all cells, see `encode_maze`. `load_maze` tells them apart by magic
+bytes.
+
+Compression codec is chosen by the last suffix (`.gz`, `.xz`, `.bz2`, see `compression.SUFFIXES`) or explicitly. The
+binary format records its codec in the header, JSON files are recognized by magic bytes of their codec.
+
+Binary files dumped with `mappable=True` store one plain byte per cell and can be opened with `load_maze(path,
+mapped=True)`: the maze then reads its walls straight from the memory-mapped file and is read-only.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
 from os import PathLike
+from pathlib import Path
+from typing import IO, Any
+
+from labyrinths.compression import NONE, SUFFIXES, ZLIB, Codec, codec_for_magic, get_codec, get_codec_by_id
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, CellKind, MazeData, MazeField, WallBuffer
+from labyrinths.utils import dump
+
+BINARY_MAGIC = b"LBRM"
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".maze"
+
+# magic, version, flags, columns, rows
+HEADER = struct.Struct("!4sBBII")
+
+# Body is compressed, with zlib unless the codec id is set.
+FLAG_COMPRESSED = 1
+# Body holds two cells per byte: even cells in the low nibble, odd cells in the high one.
+FLAG_NIBBLES = 2
+# High bits of flags hold the compression codec id.
+CODEC_SHIFT = 4
+
+_LOW_NIBBLE = bytes(i & 0x0F for i in range(256))
+_HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+_TO_HIGH_NIBBLE = bytes((i << 4) & 0xFF for i in range(256))
+
+
+def _pack_nibbles(walls: WallBuffer) -> bytes:
+    low = bytes(walls[0::2])
+    high = bytes(walls[1::2]).translate(_TO_HIGH_NIBBLE)
+    # Nibbles don't overlap, so OR-ing whole buffers as big integers merges them byte by byte.
+    packed = int.from_bytes(low, "little") | int.from_bytes(high, "little")
+    return packed.to_bytes(len(low), "little")
+
+
+def _unpack_nibbles(packed: bytes, count: int) -> bytearray:
+    walls = bytearray(count)
+    walls[0::2] = packed.translate(_LOW_NIBBLE)[: (count + 1) // 2]
+    walls[1::2] = packed.translate(_HIGH_NIBBLE)[: count // 2]
+    return walls
+
+
+def _compression_flags(codec: Codec) -> int:
+    return 0 if codec is NONE else FLAG_COMPRESSED | codec.id << CODEC_SHIFT
+
+
+def encode_maze(maze: MazeData, compress: bool = True, codec: str = ZLIB.name) -> bytes:
+    """Encode a maze into the binary format, compressing it with given codec."""
+    compression = get_codec(codec) if compress else NONE
+    flags = FLAG_NIBBLES | _compression_flags(compression)
+    body = compression.compress(_pack_nibbles(maze.walls))
+    return HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, maze.columns, maze.rows) + body
+
+
+def _decode_header(data: bytes | mmap.mmap) -> tuple[int, int, int]:
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated maze header")
+    magic, version, flags, columns, rows = HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary maze")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary maze version {version}")
+    return flags, columns, rows
+
+
+def decode_maze(data: bytes) -> MazeData:
+    """Decode a maze from the binary format."""
+    flags, columns, rows = _decode_header(data)
+    body = data[HEADER.size :]
+    if flags & FLAG_COMPRESSED:
+        # Files written before codecs were added have no codec id and are compressed with zlib.
+        body = get_codec_by_id(flags >> CODEC_SHIFT or ZLIB.id).decompress(body)
+    count = columns * rows
+    expected = (count + 1) // 2 if flags & FLAG_NIBBLES else count
+    if len(body) != expected:
+        raise ValueError(f"Expected {expected} bytes of maze data, got {len(body)}")
+    walls = _unpack_nibbles(body, count) if flags & FLAG_NIBBLES else bytearray(body)
+    return MazeData(columns, rows, MazeField(columns, rows, walls))
+
+
+def is_binary_path(path: PathLike | str) -> bool:
+    """Check if a maze at given path should be stored in the binary format."""
+    return BINARY_SUFFIX in Path(path).suffixes
+
 
-from labyrinths.maze import MazeData
-from labyrinths.utils import dump, load
+def codec_for_path(path: PathLike | str) -> Codec | None:
+    """Get the codec chosen by the last suffix of a path, None if it doesn't name one."""
+    name = SUFFIXES.get(Path(path).suffix)
+    return get_codec(name) if name is not None else None
 
 
-def load_maze(path: PathLike | str) -> MazeData:
-    """Load a maze from given path"""
+def _map_maze(path: PathLike | str) -> MazeData:
     with open(path, "rb") as file:
-        return load(MazeData, gzip.decompress(file.read()).decode())
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        flags, columns, rows = _decode_header(mapping)
+        if flags:
+            raise ValueError(f"Maze at {path} is packed or compressed and can't be mapped, dump it with mappable=True")
+        if len(mapping) != HEADER.size + columns * rows:
+            raise ValueError(f"Expected {columns * rows} bytes of maze data, got {len(mapping) - HEADER.size}")
+        # The memoryview keeps the mapping alive for as long as the maze is used.
+        return MazeData(columns, rows, MazeField(columns, rows, memoryview(mapping)[HEADER.size :]))
+    except BaseException:
+        mapping.close()
+        raise
 
 
-def dump_maze(maze: MazeData, path: PathLike | str) -> None:
-    """Dump a maze into given path. Usually extension is .json.gz"""
+class _JSONStream:
+    """Reads JSON values one by one from a text file, keeping only a small window of it in memory."""
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+        self.text = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read the next chunk. Return False at the end of file."""
+        chunk = self.file.read(self.CHUNK_SIZE)
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, empty at the end of file."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.text) or not self._fill():
+                return self.text[self.pos : self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in maze JSON, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk.
+            if end < len(self.text) or isinstance(value, (dict, list, str)) or not self._fill():
+                self.pos = end
+                return value
+
+    def items(self, close: str) -> Iterator[None]:
+        """Yield before every item of an array or object whose opening bracket was consumed."""
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.expect(close + ",") == close:
+                return
+
+
+def _cell_bits(cell: dict[str, int]) -> int:
+    if cell["kind"] != CellKind.EMPTY.value:
+        raise ValueError(f"Unsupported cell kind: {cell['kind']}")
+    # WallKind.WALL is 1 and WallKind.EMPTY is 0.
+    return LEFT * cell["left"] | RIGHT * cell["right"] | UP * cell["up"] | DOWN * cell["down"]
+
+
+def _load_json_stream(file: IO[str]) -> MazeData:
+    """Load a maze from `utils.dump` output, filling wall bits cell by cell as they are parsed."""
+    stream = _JSONStream(file)
+    size: dict[str, int] = {}
+    walls = bytearray()
+    stream.expect("{")
+    for _ in stream.items("}"):
+        key = stream.value()
+        stream.expect(":")
+        if key != "field":
+            size[key] = stream.value()
+            continue
+        stream.expect("[")
+        for _ in stream.items("]"):
+            stream.expect("[")
+            for _ in stream.items("]"):
+                walls.append(_cell_bits(stream.value()))
+    if stream.peek():
+        raise ValueError("Unexpected data after maze JSON")
+    return MazeData(size["columns"], size["rows"], MazeField(size["columns"], size["rows"], walls))
+
+
+def load_maze(path: PathLike | str, mapped: bool = False) -> MazeData:
+    """Load a maze from given path
+
+    With `mapped`, the binary file is memory-mapped instead of being read, see module docstring. JSON files are
+    parsed while being decompressed, so only the resulting maze is held in memory.
+    """
+    if mapped:
+        return _map_maze(path)
+    with open(path, "rb") as file:
+        head = file.read(8)
+        if head.startswith(BINARY_MAGIC):
+            return decode_maze(head + file.read())
+    codec = codec_for_magic(head)
+    assert codec.open is not None
+    with codec.open(path, "rt", encoding="utf-8") as text:
+        return _load_json_stream(text)
+
+
+def dump_maze(
+    maze: MazeData,
+    path: PathLike | str,
+    binary: bool | None = None,
+    compress: bool = True,
+    mappable: bool = False,
+    codec: str | None = None,
+) -> None:
+    """Dump a maze into given path. Usually extension is .json.gz or .maze
+
+    By default, the format and the codec are chosen by the extension: zlib for binary files and gzip for JSON ones
+    unless the suffix names another codec. `compress` only affects the binary format. `mappable` forces the binary
+    format without packing and compression, so that the file can be loaded with `mapped=True`.
+    """
+    if binary is None:
+        binary = is_binary_path(path)
+    compression = get_codec(codec) if codec is not None else codec_for_path(path)
+    if not binary and not mappable and compression is not None and compression.open is None:
+        raise ValueError(f"Codec {compression.name} can't compress JSON files")
     with open(path, "wb") as file:
-        file.write(gzip.compress(dump(maze).encode()))
+        if mappable:
+            file.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, maze.columns, maze.rows))
+            file.write(maze.walls)
+        elif binary:
+            file.write(encode_maze(maze, compress, (compression or ZLIB).name))
+        else:
+            file.write((compression or get_codec("gzip")).compress(dump(maze).encode()))
+
+
+def dump_maze_stream(
+    path: PathLike | str,
+    columns: int,
+    rows: int,
+    column_walls: Iterable[bytes],
+    compress: bool = True,
+    codec: str | None = None,
+) -> None:
+    """Dump a maze given as wall bits of each column into given path in the binary format.
+
+    Columns are written as they arrive, so the whole maze is never held in memory. The codec is chosen as in
+    `dump_maze`. Without `compress`, the file can be loaded with `mapped=True`. The maze is written next to `path`
+    and renamed into place when complete, so a failed dump leaves no partial file behind.
+    """
+    compression = (get_codec(codec) if codec is not None else codec_for_path(path) or ZLIB) if compress else NONE
+    compressor = compression.compressor()
+    written = 0
+    partial = Path(path).with_name(Path(path).name + ".partial")
+    try:
+        with open(partial, "wb") as file:
+            file.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, _compression_flags(compression), columns, rows))
+            for column in column_walls:
+                if len(column) != rows:
+                    raise ValueError(f"Expected column of {rows} cells, got {len(column)}")
+                file.write(compressor.compress(column))
+                written += 1
+            file.write(compressor.flush())
+        if written != columns:
+            raise ValueError(f"Expected {columns} columns, got {written}")
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+def convert_maze(
+    source: PathLike | str,
+    destination: PathLike | str,
+    binary: bool | None = None,
+    mappable: bool = False,
+    codec: str | None = None,
+) -> None:
+    """Convert a maze file into another format and codec, chosen the same way as in `dump_maze`."""
+    dump_maze(load_maze(source), destination, binary, mappable=mappable, codec=codec)
@@ -0,0 +1,103 @@
+"""Path queries on perfect mazes without searching.
+
+Every maze produced by the generators is a spanning tree, so the only path between two cells goes through their lowest
+common ancestor. `PathIndex` roots the tree once, after that `path` costs O(log n) plus the length of the path and
+`distance` costs O(log n). Mazes that are not trees are answered by `MazeSolver` instead.
+"""
+
+from array import array
+
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, MazeData
+from labyrinths.solver import MazeSolver, Solution, closed_walls
+
+
+class PathIndex:
+    """Parent, depth and binary lifting tables of a maze rooted at `root`."""
+
+    def __init__(self, maze: MazeData, root: tuple[int, int] = (0, 0)) -> None:
+        self.maze = maze
+        self.rows = maze.rows
+        self.root = root[0] * maze.rows + root[1]
+
+        walls = closed_walls(maze)
+        steps = ((LEFT, -maze.rows), (RIGHT, maze.rows), (UP, -1), (DOWN, 1))
+        self.parent = parent = array("i", [-1]) * len(walls)
+        self.depth = depth = array("i", [0]) * len(walls)
+        queue = array("i", bytes(parent.itemsize * len(walls)))
+        queue[0] = parent[self.root] = self.root
+        head, tail = 0, 1
+        self.is_tree = True
+        while head < tail and self.is_tree:
+            cell = queue[head]
+            head += 1
+            bits = walls[cell]
+            for bit, delta in steps:
+                if bits & bit:
+                    continue
+                neighbour = cell + delta
+                if parent[neighbour] < 0:
+                    parent[neighbour] = cell
+                    depth[neighbour] = depth[cell] + 1
+                    queue[tail] = neighbour
+                    tail += 1
+                elif neighbour != parent[cell]:
+                    # Reached a cell for the second time, there is a loop.
+                    self.is_tree = False
+        self.is_tree = self.is_tree and tail == len(walls)
+        # jumps[k][cell] is the ancestor 2**k levels above cell, built on first use.
+        self._jumps: list[array] = []
+
+    def _build_jumps(self) -> None:
+        self._jumps = [self.parent]
+        for _ in range(max(self.depth).bit_length() - 1):
+            previous = self._jumps[-1]
+            self._jumps.append(array("i", map(previous.__getitem__, previous)))
+
+    def _lca(self, a: int, b: int) -> int:
+        if not self._jumps:
+            self._build_jumps()
+        depth, jumps = self.depth, self._jumps
+        if depth[a] < depth[b]:
+            a, b = b, a
+        difference, level = depth[a] - depth[b], 0
+        while difference:
+            if difference & 1:
+                a = jumps[level][a]
+            difference >>= 1
+            level += 1
+        if a == b:
+            return a
+        for jump in reversed(jumps):
+            if jump[a] != jump[b]:
+                a, b = jump[a], jump[b]
+        return self.parent[a]
+
+    def lca(self, a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
+        """Lowest common ancestor of two cells. Only valid when the maze is a tree."""
+        if not self.is_tree:
+            raise ValueError("Maze is not a tree")
+        return divmod(self._lca(a[0] * self.rows + a[1], b[0] * self.rows + b[1]), self.rows)
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        """Number of steps between two cells."""
+        if not self.is_tree:
+            return len(self.path(a, b).path) - 1
+        a_id, b_id = a[0] * self.rows + a[1], b[0] * self.rows + b[1]
+        return self.depth[a_id] + self.depth[b_id] - 2 * self.depth[self._lca(a_id, b_id)]
+
+    def path(self, a: tuple[int, int], b: tuple[int, int]) -> Solution:
+        """The path between two cells, same as `MazeSolver(maze, a, b).solve()`."""
+        if not self.is_tree:
+            return MazeSolver(self.maze, a, b).solve()
+        a_id, b_id = a[0] * self.rows + a[1], b[0] * self.rows + b[1]
+        ancestor = self._lca(a_id, b_id)
+        up, down = [], []
+        while a_id != ancestor:
+            up.append(a_id)
+            a_id = self.parent[a_id]
+        while b_id != ancestor:
+            down.append(b_id)
+            b_id = self.parent[b_id]
+        up.append(ancestor)
+        up.extend(reversed(down))
+        return Solution([divmod(cell, self.rows) for cell in up])
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from labyrinths import utils
 from labyrinths.connection.client import ClientToHostConnection
+from labyrinths.game.game import maze_from_spec
 from labyrinths.maze import MazeData
 from labyrinths.session.types import ClientInfo, Player
 from labyrinths.ui import Widget
@@ -27,6 +28,7 @@ class ClientSession:
         self.maze_widget.on_move_down = self._move_down
         self.maze_widget.on_move_left = self._move_left
         self.maze_widget.on_move_right = self._move_right
+        self.maze_widget.on_hint = self._request_hint
         self.maze: MazeData | None = None
         self.players: dict[int, Player] = {}
         self.clients: dict[int, ClientInfo] = {}
@@ -38,17 +40,24 @@ class ClientSession:
         # TODO: other possible fields: player infos, host info, ping, chat messages, etc.
 
     def _move_up(self):
+        self.maze_widget.hint = None
         self.conn.send_packet("game.client.movement", {"dir": "up"})
 
     def _move_down(self):
+        self.maze_widget.hint = None
         self.conn.send_packet("game.client.movement", {"dir": "down"})
 
     def _move_right(self):
+        self.maze_widget.hint = None
         self.conn.send_packet("game.client.movement", {"dir": "right"})
 
     def _move_left(self):
+        self.maze_widget.hint = None
         self.conn.send_packet("game.client.movement", {"dir": "left"})
 
+    def _request_hint(self):
+        self.conn.send_packet("game.client.hint", {})
+
     def update(self):
         self.conn.update()
 
@@ -74,25 +83,25 @@ class ClientSession:
             case "game.new":
                 self.maze_widget.show()
                 self.maze_widget.solution = None
+                self.maze_widget.hint = None
+                self.maze_widget.leaderboard = []
                 self.maze_widget.winner_name = None
                 self.maze_widget.winner_color = None
-                self.maze = utils.load_from_dict(MazeData, data["maze"])
-                assert self.maze is not None
                 self.players.clear()
-                self.maze_widget.set_maze(self.maze)
+                self._set_maze(data)
                 self.maze_widget.set_players(self.players)
             case "game.winner":
                 self.maze_widget.winner_name = self.players[data["id"]].client.name
                 self.maze_widget.winner_color = self.players[data["id"]].client.color
             case "game.sync_info":
                 self.maze_widget.show()
-                self.maze = utils.load_from_dict(MazeData, data["maze"])
                 self.players = {
                     item["id"]: Player(self.clients[item["id"]], item["x"], item["y"]) for item in data["players"]
                 }
-                assert self.maze is not None
-                self.maze_widget.set_maze(self.maze)
+                self._set_maze(data)
                 self.maze_widget.set_players(self.players)
+            case "game.maze":
+                self._set_maze(data)
             case "game.end":
                 self.maze_widget.hide()
             case "game.show_solution":
@@ -104,8 +113,22 @@ class ClientSession:
             case "game.movement":
                 self.players[data["id"]].x = data["x"]
                 self.players[data["id"]].y = data["y"]
+            case "game.hint":
+                self.maze_widget.hint = (data["x"], data["y"]) if data else None
+            case "game.leaderboard":
+                self.maze_widget.leaderboard = [item["id"] for item in data["players"]]
             case "game.chat":
                 self.chat_widget.put(data["message"], self.clients[data["id"]].name, self.clients[data["id"]].color)
 
+    def _set_maze(self, data: dict) -> None:
+        if "maze" in data:
+            self.maze = utils.load_from_dict(MazeData, data["maze"])
+        else:
+            self.maze = maze_from_spec(data["spec"])
+            if self.maze is None:
+                # Different generator version, fall back to full transfer.
+                self.conn.send_packet("game.client.request_maze", {})
+        self.maze_widget.set_maze(self.maze)
+
     def admin_command(self, command: str, data: dict):
         self.conn.send_packet(f"admin.{command}", data)
@@ -1,32 +1,137 @@
 """Host session"""
 
+import logging
 import random
+from concurrent.futures import Future
 
 from labyrinths import utils
 from labyrinths.connection.host import HostConnectionSet
 from labyrinths.game.game import Game
+from labyrinths.game.pool import MazePool, ReadyMaze
+from labyrinths.generators.difficulty import DifficultyConstraints
 from labyrinths.session.types import ClientInfo, Player
 
+logger = logging.getLogger(__name__)
+
+# Longest constrained maze search a client can ask for, in seconds.
+MAX_SEARCH_DEADLINE = 10.0
+# Largest maze a client can ask for, in cells.
+MAX_GAME_CELLS = 4_000_000
+
 
 class HostSession:
     """Host session. Hosts games."""
 
-    def __init__(self, conn_set: HostConnectionSet):
+    def __init__(self, conn_set: HostConnectionSet, pool: MazePool | None = None):
         self.conn_set = conn_set
         self.admin_ids: list[int] = []
         self.conn_set.set_handler(self.handle_packet)
         self.clients: dict[int, ClientInfo] = {}
 
         self.game: Game | None = None
+        # Pre-generated mazes for new games, optional. Owned by the session, shut down in `close`.
+        self.pool = pool
+        # Order of players in the last broadcast leaderboard.
+        self.leaderboard: list[int] = []
+        # Constrained maze search running for a new_game command, with the command data.
+        self.search: tuple[dict, Future[ReadyMaze]] | None = None
+
+    def close(self) -> None:
+        """Stop the maze search and the pool's worker processes."""
+        if self.search is not None:
+            self.search[1].cancel()
+            self.search = None
+        if self.pool is not None:
+            self.pool.close()
 
     def handle_admin_command(self, command: str, data: dict) -> None:
         if command == "new_game":
-            self.game = Game(data["w"], data["h"], data.get("algo", "kruskal"))
-            self.conn_set.broadcast("game.new", {"maze": utils.dump_to_dict(self.game.maze)})
-            for client_id, client in self.clients.items():
-                player = Player(self.clients[client_id], 0, 0)
-                self.game.players[client_id] = player
-                self.conn_set.broadcast("game.new_player", {"id": client_id, "x": player.x, "y": player.y})
+            try:
+                game = self.new_game(data)
+            except ValueError as e:
+                logger.warning(f"Ignoring invalid new_game command: {e}")
+                return
+            if game is not None:
+                self.start_game(game)
+
+    def update(self) -> None:
+        """Start the game once a constrained maze search has finished. Called from the host loop."""
+        if self.search is None or not self.search[1].done():
+            return
+        data, search = self.search
+        self.search = None
+        try:
+            game = Game(data["w"], data["h"], data.get("algo", "kruskal"), *search.result())
+        except TimeoutError:
+            logger.warning(f"No maze matching {data['constraints']} found in time, ignoring constraints")
+            try:
+                game = self.unconstrained_game(data)
+            except Exception:
+                logger.exception(f"Failed to create a game for new_game command {data}")
+                return
+        except Exception:
+            # Also a broken pool or a worker out of memory, which must not stop the host.
+            logger.exception(f"Maze search for new_game command {data} failed")
+            return
+        self.start_game(game)
+
+    def start_game(self, game: Game) -> None:
+        """Replace the current game and announce it to all clients."""
+        self.game = game
+        # Clients regenerate the maze from its seed and ask for the full maze only if that fails.
+        self.conn_set.broadcast("game.new", {"spec": self.game.spec})
+        for client_id, client in self.clients.items():
+            player = Player(self.clients[client_id], 0, 0)
+            self.game.players[client_id] = player
+            self.conn_set.broadcast("game.new_player", {"id": client_id, "x": player.x, "y": player.y})
+        self.leaderboard = []
+        self.update_leaderboard()
+
+    def update_leaderboard(self) -> None:
+        """Broadcast players ranked by distance to the exit if their order has changed."""
+        assert self.game
+        ranking = self.game.ranking()
+        if [client_id for client_id, _ in ranking] == self.leaderboard:
+            return
+        self.leaderboard = [client_id for client_id, _ in ranking]
+        self.conn_set.broadcast(
+            "game.leaderboard",
+            {"players": [{"id": client_id, "distance": distance} for client_id, distance in ranking]},
+        )
+
+    def new_game(self, data: dict) -> Game | None:
+        """Create a game for admin new_game command.
+
+        Return None if a constrained search was started instead, `update` starts the game when it finishes.
+        Raise ValueError on invalid size, constraints or deadline.
+        """
+        w, h = data.get("w"), data.get("h")
+        if not all(isinstance(side, int) and not isinstance(side, bool) and side > 0 for side in (w, h)):
+            raise ValueError(f"Maze size must be positive integers, got {w!r} x {h!r}")
+        if data["w"] * data["h"] > MAX_GAME_CELLS:
+            raise ValueError(f"Maze of {w} x {h} cells exceeds {MAX_GAME_CELLS} cells")
+        if "constraints" in data and self.pool is not None:
+            constraints = DifficultyConstraints.from_dict(data["constraints"])
+            deadline = data.get("deadline", 5.0)
+            if isinstance(deadline, bool) or not isinstance(deadline, int | float):
+                raise ValueError(f"Deadline must be a number, got {deadline!r}")
+            deadline = min(max(deadline, 0.0), MAX_SEARCH_DEADLINE)
+            if self.search is not None:
+                # Superseded by the new command.
+                self.search[1].cancel()
+            algo = data.get("algo", "kruskal")
+            self.search = data, self.pool.find(algo, data["w"], data["h"], constraints, deadline, data.get("seed"))
+            return None
+        if "constraints" in data:
+            logger.warning("No maze pool to search for constrained mazes, ignoring constraints")
+        return self.unconstrained_game(data)
+
+    def unconstrained_game(self, data: dict) -> Game:
+        w, h, algo, seed = data["w"], data["h"], data.get("algo", "kruskal"), data.get("seed")
+        ready = self.pool.take(algo, w, h) if self.pool is not None and seed is None else None
+        if ready is not None:
+            return Game(w, h, algo, *ready)
+        return Game(w, h, algo, seed)
 
     def get_color(self):
         return random.choice([(35, 153, 255), (153, 102, 204), (252, 40, 71), (121, 179, 170), (135, 206, 250)])
@@ -56,7 +161,7 @@ class HostSession:
                     conn.send_packet(
                         "game.sync_info",
                         {
-                            "maze": utils.dump_to_dict(self.game.maze),
+                            "spec": self.game.spec,
                             "players": [
                                 {"id": player_id, "x": player.x, "y": player.y}
                                 for player_id, player in self.game.players.items()
@@ -72,6 +177,7 @@ class HostSession:
                 if self.game:
                     self.game.players[client_id] = player = Player(self.clients[client_id], 0, 0)
                     self.conn_set.broadcast("game.new_player", {"id": client_id, "x": player.x, "y": player.y})
+                    self.update_leaderboard()
 
             case "session.client.disconnect":
                 assert self.game
@@ -81,16 +187,31 @@ class HostSession:
                     if self.game and client_id in self.game.players.keys():
                         self.game.players.pop(client_id)
                         self.conn_set.broadcast("game.remove_player", {"id": client_id})
+                        self.update_leaderboard()
 
             case "game.client.movement":
                 assert self.game
                 result = self.game.handle_movement(client_id, data["dir"])
                 if result is not None:
                     self.conn_set.broadcast("game.movement", {"id": client_id, "x": result[0], "y": result[1]})
+                    self.update_leaderboard()
                 if self.game.winner_id is not None and not self.game.ended:
                     self.game.ended = True
                     self.conn_set.broadcast("game.winner", {"id": self.game.winner_id})
                     self.conn_set.broadcast("game.show_solution", {})
 
+            case "game.client.request_maze":
+                assert self.game
+                self.conn_set.connections[client_id].send_packet(
+                    "game.maze", {"maze": utils.dump_to_dict(self.game.maze)}
+                )
+
+            case "game.client.hint":
+                assert self.game
+                hint = self.game.hint(client_id)
+                self.conn_set.connections[client_id].send_packet(
+                    "game.hint", {"x": hint[0], "y": hint[1]} if hint is not None else {}
+                )
+
             case "game.client.chat":
                 self.conn_set.broadcast("game.chat", {"id": client_id, **data})
@@ -0,0 +1,142 @@
+"""Cache of maze solutions keyed by maze content.
+
+Solutions are kept in memory in LRU order, bounded by the total number of cells in cached paths. Optionally they are
+also stored in a directory, usually next to the maze files, bounded by the total size of the stored files.
+"""
+
+import os
+import zlib
+from array import array
+from collections import OrderedDict
+from os import PathLike
+from pathlib import Path
+
+from labyrinths.maze import MazeData
+from labyrinths.solver import MazeSolver, Solution
+
+SOLUTION_SUFFIX = ".sol"
+
+CacheKey = tuple[str, tuple[int, int], tuple[int, int]]
+
+
+class SolutionCache:
+    """LRU cache of solutions with an optional on-disk tier."""
+
+    def __init__(
+        self, max_cells: int = 4_000_000, directory: PathLike | str | None = None, max_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.max_cells = max_cells
+        self.directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+        self.cells = 0
+        self.entries: OrderedDict[CacheKey, Solution] = OrderedDict()
+        # Sizes of stored files by name in LRU order, and their total. Read from the directory once, then kept
+        # up to date, so that storing a solution doesn't list the directory.
+        self.files: OrderedDict[str, int] = OrderedDict()
+        self.bytes = 0
+        if self.directory is not None and self.directory.is_dir():
+            stats = [(path.stat(), path.name) for path in self.directory.glob(f"*{SOLUTION_SUFFIX}")]
+            for stat, name in sorted(stats, key=lambda item: item[0].st_mtime):
+                self.files[name] = stat.st_size
+                self.bytes += stat.st_size
+
+    @staticmethod
+    def key(maze: MazeData, begin: tuple[int, int] = (0, 0), end: tuple[int, int] | None = None) -> CacheKey:
+        """Cache key of the solution between given cells."""
+        return maze.content_hash(), begin, end or (maze.columns - 1, maze.rows - 1)
+
+    def _path_for(self, key: CacheKey) -> Path:
+        assert self.directory is not None
+        maze_hash, (bx, by), (ex, ey) = key
+        return self.directory / f"{maze_hash}-{bx}_{by}-{ex}_{ey}{SOLUTION_SUFFIX}"
+
+    def _remember(self, key: CacheKey, solution: Solution) -> None:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+        self.entries[key] = solution
+        self.cells += len(solution.path)
+        while self.cells > self.max_cells and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.cells -= len(evicted.path)
+
+    def _load(self, key: CacheKey) -> Solution | None:
+        if self.directory is None:
+            return None
+        path = self._path_for(key)
+        try:
+            compressed = path.read_bytes()
+            data = zlib.decompress(compressed)
+        except FileNotFoundError:
+            # Removed behind our back.
+            self.bytes -= self.files.pop(path.name, 0)
+            return None
+        except zlib.error:
+            return None
+        # Touch the file, so that the LRU order survives restarts.
+        os.utime(path)
+        self._index(path.name, len(compressed))
+        coordinates = array("i", data)
+        return Solution(list(zip(coordinates[0::2], coordinates[1::2])))
+
+    def _store(self, key: CacheKey, solution: Solution) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        coordinates = array("i", (value for cell in solution.path for value in cell))
+        path = self._path_for(key)
+        compressed = zlib.compress(coordinates.tobytes())
+        path.write_bytes(compressed)
+        self._index(path.name, len(compressed))
+        self._evict_files(path.name)
+
+    def _index(self, name: str, size: int) -> None:
+        """Record a file as the most recently used one."""
+        self.bytes += size - self.files.pop(name, 0)
+        self.files[name] = size
+
+    def _evict_files(self, keep: str) -> None:
+        """Remove least recently used files except `keep` until they fit into max_bytes."""
+        assert self.directory is not None
+        while self.bytes > self.max_bytes and len(self.files) > 1:
+            name, size = self.files.popitem(last=False)
+            if name == keep:
+                self.files[name] = size
+                continue
+            (self.directory / name).unlink(missing_ok=True)
+            self.bytes -= size
+
+    def get(
+        self, maze: MazeData, begin: tuple[int, int] = (0, 0), end: tuple[int, int] | None = None
+    ) -> Solution | None:
+        """Get a cached solution, None if there is none."""
+        key = self.key(maze, begin, end)
+        solution = self.entries.get(key) or self._load(key)
+        if solution is not None:
+            self._remember(key, solution)
+        return solution
+
+    def put(
+        self, maze: MazeData, solution: Solution, begin: tuple[int, int] = (0, 0), end: tuple[int, int] | None = None
+    ) -> None:
+        """Cache a solution."""
+        key = self.key(maze, begin, end)
+        self._remember(key, solution)
+        self._store(key, solution)
+
+    def solve(self, maze: MazeData, begin: tuple[int, int] = (0, 0), end: tuple[int, int] | None = None) -> Solution:
+        """Get a cached solution or solve the maze and cache the result."""
+        solution = self.get(maze, begin, end)
+        if solution is None:
+            solution = MazeSolver(maze, begin, end).solve()
+            self.put(maze, solution, begin, end)
+        return solution
+
+    def clear(self) -> None:
+        """Forget solutions kept in memory. Files are kept."""
+        self.entries.clear()
+        self.cells = 0
+
+
+# Shared by the UI.
+solution_cache = SolutionCache()
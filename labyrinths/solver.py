@@ -1,9 +1,14 @@
 """Solver for labyrinths."""
 
-from collections import deque
+import heapq
+import multiprocessing
+import os
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
-from labyrinths.maze import MazeData, WallKind
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, MazeData, MazeField
 
 
 @dataclass
@@ -17,53 +22,320 @@ class NoSolution(Exception):
     """Raised when no solution is found."""
 
 
+def closed_walls(maze: MazeData) -> bytearray:
+    """Copy of maze walls with the outer border closed, so that searches never step outside the maze."""
+    walls = bytearray(maze.walls)
+    rows = maze.rows
+    for start in range(0, len(walls), rows):
+        walls[start] |= UP
+        walls[start + rows - 1] |= DOWN
+    for y in range(rows):
+        walls[y] |= LEFT
+        walls[len(walls) - rows + y] |= RIGHT
+    return walls
+
+
 class MazeSolver:
-    """Solver for labyrinths."""
+    """Solver for labyrinths.
+
+    Cells are addressed by their index in maze walls (x * rows + y). Breadth first search keeps links between them
+    in flat arrays, allocated when it starts. The bidirectional and A* searches usually stop after a small part of
+    the maze, so they keep links only for reached cells.
+
+    Modes:
+    - "bfs": breadth first search from `begin`, stops as soon as `end` is reached.
+    - "bidirectional": breadth first search from both ends until the searches meet.
+    - "astar": A* with Manhattan distance heuristic.
+
+    All modes find a shortest path.
+    """
+
+    MODES = ("bfs", "bidirectional", "astar")
 
     def __init__(
         self,
         maze: MazeData,
         begin: tuple[int, int] = (0, 0),
         end: tuple[int, int] | None = None,
+        mode: str = "bfs",
     ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown solver mode {mode}")
+        self.mode = mode
         self.begin = begin
         self.end = end or (maze.columns - 1, maze.rows - 1)
         self.size = maze.columns, maze.rows
         self.maze = maze
 
-        self.visited = [[False for _ in range(maze.rows)] for _ in range(maze.columns)]
-        self.previous: dict[tuple[int, int], tuple[int, int]] = {}
+        # Read in place, cells on the border are checked in `neighbours`.
+        self.walls = maze.walls
+        # Link from each reached cell towards `begin`, use `link` to read it.
+        self.previous: array | dict[int, int] = {}
+        # Links from cells towards `end`, used by the bidirectional search.
+        self.following: dict[int, int] = {}
         self.finished = False
+        # Reached cells in order of distance from begin, see `flood`.
+        self.queue = array("i")
+
+    def cell_id(self, x: int, y: int) -> int:
+        """Get id of the cell (x, y)."""
+        return x * self.size[1] + y
+
+    def cell_at(self, cell: int) -> tuple[int, int]:
+        """Get coordinates of the cell with given id."""
+        return divmod(cell, self.size[1])
+
+    def neighbours(self, cell: int) -> list[int]:
+        """Cells reachable from given one in one step."""
+        bits = self.walls[cell]
+        rows = self.size[1]
+        y = cell % rows
+        result = []
+        if not bits & LEFT and cell >= rows:
+            result.append(cell - rows)
+        if not bits & RIGHT and cell < len(self.walls) - rows:
+            result.append(cell + rows)
+        if not bits & UP and y:
+            result.append(cell - 1)
+        if not bits & DOWN and y < rows - 1:
+            result.append(cell + 1)
+        return result
+
+    def link(self, cell: int) -> int:
+        """Link from a reached cell towards `begin`, -1 if the cell wasn't reached."""
+        if isinstance(self.previous, dict):
+            return self.previous.get(cell, -1)
+        return self.previous[cell]
+
+    def _bfs(self, begin: int, end: int) -> int:
+        walls, rows = self.walls, self.size[1]
+        last_column, last_row = len(walls) - rows, rows - 1
+        previous = self.previous = array("i", [-1]) * len(walls)
+        queue = self.queue = array("i", bytes(previous.itemsize * len(walls)))
+        queue[0] = begin
+        previous[begin] = begin
+        head, tail = 0, 1
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            if cell == end:
+                break
+            bits = walls[cell]
+            y = cell % rows
+            # Unrolled over directions, this loop runs once for every reached cell.
+            if not bits & LEFT and cell >= rows and previous[cell - rows] < 0:
+                previous[cell - rows] = cell
+                queue[tail] = cell - rows
+                tail += 1
+            if not bits & RIGHT and cell < last_column and previous[cell + rows] < 0:
+                previous[cell + rows] = cell
+                queue[tail] = cell + rows
+                tail += 1
+            if not bits & UP and y and previous[cell - 1] < 0:
+                previous[cell - 1] = cell
+                queue[tail] = cell - 1
+                tail += 1
+            if not bits & DOWN and y < last_row and previous[cell + 1] < 0:
+                previous[cell + 1] = cell
+                queue[tail] = cell + 1
+                tail += 1
+        del queue[tail:]
+        return end if previous[end] >= 0 else -1
+
+    def flood(self) -> array:
+        """Reach every cell reachable from `begin`. Return ids of reached cells in order of distance from it."""
+        self._bfs(self.cell_id(*self.begin), -1)
+        return self.queue
+
+    def _expand(self, frontier: list[int], links: dict[int, int], other_links: dict[int, int]) -> tuple[list[int], int]:
+        """Expand frontier by one level. Return the next level and the cell where the searches met, or -1."""
+        level: list[int] = []
+        for cell in frontier:
+            for neighbour in self.neighbours(cell):
+                if neighbour in links:
+                    continue
+                links[neighbour] = cell
+                if neighbour in other_links:
+                    return level, neighbour
+                level.append(neighbour)
+        return level, -1
+
+    def _bidirectional(self, begin: int, end: int) -> int:
+        previous = self.previous = {begin: begin}
+        following = self.following = {end: end}
+        if begin == end:
+            return begin
+        forward, backward = [begin], [end]
+        while forward and backward:
+            # Expand the smaller frontier.
+            if len(forward) <= len(backward):
+                forward, meeting = self._expand(forward, previous, following)
+            else:
+                backward, meeting = self._expand(backward, following, previous)
+            if meeting >= 0:
+                return meeting
+        return -1
+
+    def _astar(self, begin: int, end: int) -> int:
+        rows = self.size[1]
+        ex, ey = divmod(end, rows)
+        previous = self.previous = {begin: begin}
+        distance = {begin: 0}
+        heap = [(0, 0, begin)]
+        while heap:
+            _, steps, cell = heapq.heappop(heap)
+            if cell == end:
+                return cell
+            if steps > distance[cell]:
+                continue
+            for neighbour in self.neighbours(cell):
+                if steps + 1 < distance.get(neighbour, steps + 2):
+                    distance[neighbour] = steps + 1
+                    previous[neighbour] = cell
+                    nx, ny = divmod(neighbour, rows)
+                    heapq.heappush(heap, (steps + 1 + abs(nx - ex) + abs(ny - ey), steps + 1, neighbour))
+        return -1
 
     def solve(self) -> Solution:
         """Solve the labyrinth."""
+        begin, end = self.cell_id(*self.begin), self.cell_id(*self.end)
+        match self.mode:
+            case "bfs":
+                meeting = self._bfs(begin, end)
+            case "bidirectional":
+                meeting = self._bidirectional(begin, end)
+            case "astar":
+                meeting = self._astar(begin, end)
+        self.finished = True
+        if meeting < 0:
+            raise NoSolution
+
+        cells = []
+        current = meeting
+        while current != begin:
+            cells.append(current)
+            current = self.previous[current]
+        cells.append(begin)
+        cells.reverse()
+
+        current = meeting
+        while current != end:
+            current = self.following[current]
+            cells.append(current)
+
+        return Solution([self.cell_at(cell) for cell in cells])
 
-        queue = deque([self.begin])
-        self.visited[self.begin[0]][self.begin[1]] = True
-        while queue:
-            x, y = queue.popleft()
-            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-                nx, ny = x + dx, y + dy
-                if (
-                    self.maze.field[x][y].get_wall_at(dx, dy) == WallKind.EMPTY
-                    and 0 <= nx < self.size[0]
-                    and 0 <= ny < self.size[1]
-                    and not self.visited[nx][ny]
-                ):
-                    self.visited[nx][ny] = True
-                    self.previous[(nx, ny)] = (x, y)
-                    queue.append((nx, ny))
-
-        path = []
-
-        current = self.end
-        while current != self.begin:
-            path.append(current)
-            try:
-                current = self.previous[current]
-            except KeyError:
-                raise NoSolution
-        path.append(self.begin)
-        path.reverse()
 
+class DistanceField:
+    """Distances of all cells to `goal`, computed with one breadth first search from it.
+
+    After that, the distance and the next step towards the goal are looked up in O(1) for any cell.
+    """
+
+    def __init__(self, maze: MazeData, goal: tuple[int, int] | None = None) -> None:
+        self.goal = goal or (maze.columns - 1, maze.rows - 1)
+        self.rows = maze.rows
+        solver = MazeSolver(maze, self.goal)
+        goal_id = solver.cell_id(*self.goal)
+        reached = solver.flood()
+        # Link from each cell one step closer to the goal, -1 for unreachable cells.
+        self.next_cells = array("i", [-1]) * (maze.columns * maze.rows)
+        self.distances = array("i", [-1]) * (maze.columns * maze.rows)
+        self.distances[goal_id] = 0
+        # Walk cells in order of distance, so that the next cell always has its distance set already.
+        for cell in reached:
+            if cell != goal_id:
+                self.next_cells[cell] = next_cell = solver.link(cell)
+                self.distances[cell] = self.distances[next_cell] + 1
+
+    @classmethod
+    def from_bytes(cls, data: bytes, maze: MazeData, goal: tuple[int, int] | None = None) -> "DistanceField":
+        """Restore a field saved with `to_bytes` for the same maze and goal, without searching the maze again."""
+        cells = maze.columns * maze.rows
+        field = cls.__new__(cls)
+        field.goal = goal or (maze.columns - 1, maze.rows - 1)
+        field.rows = maze.rows
+        field.next_cells, field.distances = array("i"), array("i")
+        if len(data) != 2 * cells * field.distances.itemsize:
+            raise ValueError(f"Distance field of {len(data)} bytes doesn't match a maze of {cells} cells")
+        field.next_cells.frombytes(data[: len(data) // 2])
+        field.distances.frombytes(data[len(data) // 2 :])
+        return field
+
+    def to_bytes(self) -> bytes:
+        """Pack the field, e.g. to send it from a worker process."""
+        return self.next_cells.tobytes() + self.distances.tobytes()
+
+    def distance(self, x: int, y: int) -> int | None:
+        """Number of steps from (x, y) to the goal, None if it is unreachable."""
+        distance = self.distances[x * self.rows + y]
+        return None if distance < 0 else distance
+
+    def next_step(self, x: int, y: int) -> tuple[int, int] | None:
+        """The cell to go to from (x, y) to get closer to the goal, None if there is no such cell."""
+        cell = x * self.rows + y
+        if self.distances[cell] <= 0:
+            return None
+        return divmod(self.next_cells[cell], self.rows)
+
+    def path_from(self, x: int, y: int) -> Solution:
+        """Shortest path from (x, y) to the goal."""
+        if self.distance(x, y) is None:
+            raise NoSolution
+        cell, path = x * self.rows + y, [(x, y)]
+        while self.distances[cell]:
+            cell = self.next_cells[cell]
+            path.append(divmod(cell, self.rows))
         return Solution(path)
+
+    def rank(self, positions: dict[int, tuple[int, int]]) -> list[tuple[int, int | None]]:
+        """Sort (id, distance) pairs by distance to the goal, closest first and unreachable last."""
+        distances = {key: self.distance(x, y) for key, (x, y) in positions.items()}
+        return sorted(distances.items(), key=lambda item: (item[1] is None, item[1] or 0))
+
+
+Pair = tuple[tuple[int, int], tuple[int, int]]
+
+
+def solve_many(maze: MazeData, pairs: Sequence[Pair]) -> list[Solution | None]:
+    """Solve the maze for every (begin, end) pair, None for pairs without a path. Results go in order of pairs.
+
+    Pairs are grouped by begin, so there is one search per distinct begin cell and paths to all ends are read from
+    its links.
+    """
+    results: list[Solution | None] = [None] * len(pairs)
+    by_begin: dict[tuple[int, int], list[int]] = {}
+    for number, (begin, _) in enumerate(pairs):
+        by_begin.setdefault(begin, []).append(number)
+    for begin, numbers in by_begin.items():
+        solver = MazeSolver(maze, begin)
+        solver.flood()
+        begin_id = solver.cell_id(*begin)
+        for number in numbers:
+            cell = solver.cell_id(*pairs[number][1])
+            if solver.link(cell) < 0:
+                continue
+            cells = [cell]
+            while cell != begin_id:
+                cell = solver.link(cell)
+                cells.append(cell)
+            results[number] = Solution([solver.cell_at(cell) for cell in reversed(cells)])
+    return results
+
+
+def _solve_walls(task: tuple[int, int, bytes, Sequence[Pair]]) -> list[Solution | None]:
+    columns, rows, walls, pairs = task
+    return solve_many(MazeData(columns, rows, MazeField(columns, rows, memoryview(walls))), pairs)
+
+
+def solve_many_mazes(
+    tasks: Sequence[tuple[MazeData, Sequence[Pair]]], jobs: int | None = None
+) -> list[list[Solution | None]]:
+    """`solve_many` for every (maze, pairs) task, using `jobs` processes. Results go in order of tasks."""
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        return [solve_many(maze, pairs) for maze, pairs in tasks]
+    # Mazes travel as raw wall bytes, which also works for memory-mapped ones.
+    raw = [(maze.columns, maze.rows, bytes(maze.walls), pairs) for maze, pairs in tasks]
+    with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(_solve_walls, raw))
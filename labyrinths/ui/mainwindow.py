@@ -65,7 +65,8 @@ class Widget(abc.ABC):
             child.render_self_and_children(surface, coords)
 
     def close(self):
-        for child in self.children:
+        # Children remove themselves from the list.
+        for child in list(self.children):
             child.close()
         if self.parent:
             self.parent.children.remove(self)
@@ -179,6 +180,8 @@ class MainWindow:
             for event in pygame.event.get():
                 match event.type:
                     case pygame.QUIT:
+                        # Let widgets release what they own, e.g. the hosted game's worker processes.
+                        self.root_widget.close()
                         pygame.quit()
                         sys.exit()
                     case pygame.KEYDOWN:
@@ -2,10 +2,11 @@
 
 import logging
 import time
-from threading import Thread
+from threading import Event, Thread
 
 from labyrinths.connection.client import ClientToHostConnection
 from labyrinths.connection.host import HostConnectionSet
+from labyrinths.game.pool import MazePool
 from labyrinths.session.clientsession import ClientSession
 from labyrinths.session.hostsession import HostSession
 from labyrinths.ui import Widget
@@ -18,6 +19,32 @@ from labyrinths.ui.widgets.label import TextLabel
 logger = logging.getLogger(__name__)
 
 
+class HostedGame(Container):
+    """Container of the game hosted by this window. Runs the host session until closed."""
+
+    def __init__(self, parent: Widget, width: int, height: int, x: int, y: int, host_session: HostSession) -> None:
+        super().__init__(parent, width, height, x, y)
+        self.host_session = host_session
+        self.stopped = Event()
+        self.server = Thread(target=self.run_server, daemon=True)
+        self.server.start()
+
+    def run_server(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                self.host_session.conn_set.update()
+                self.host_session.update()
+                time.sleep(0.01)
+        finally:
+            # Closed from the server thread, so that nothing uses the pool meanwhile.
+            self.host_session.close()
+
+    def close(self) -> None:
+        self.stopped.set()
+        self.server.join(timeout=5)
+        super().close()
+
+
 class HostMenu(Container):
     """Host game Menu."""
 
@@ -64,20 +91,15 @@ class HostMenu(Container):
             # Spin up internal server.
             port = int(self.port_input.text)
             host = HostConnectionSet(self.host_input.text, port)
-            host_session = HostSession(host)
+            host_session = HostSession(host, MazePool())
 
-            def run_server() -> None:
-                while True:
-                    host.update()
-                    time.sleep(0.01)
-
-            Thread(target=run_server, daemon=True).start()
-
-            # Connect to it.
             assert self.parent is not None
             assert self.parent.parent is not None
-            cont = Container(self.parent.parent, self.parent.parent.width, self.parent.parent.height, 0, 0)
+            cont = HostedGame(
+                self.parent.parent, self.parent.parent.width, self.parent.parent.height, 0, 0, host_session
+            )
 
+            # Connect to it.
             connection = ClientToHostConnection("127.0.0.1", port)
             client_session = ClientSession(connection, cont)
             client_session.name = self.name_input.text
@@ -7,8 +7,9 @@ from typing import TYPE_CHECKING, Callable, Tuple
 import pygame
 from pygame import draw
 
-from labyrinths.maze import MazeData, WallKind
-from labyrinths.solver import MazeSolver, Solution
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, MazeData
+from labyrinths.solutioncache import solution_cache
+from labyrinths.solver import Solution
 from labyrinths.ui import Widget
 from labyrinths.ui.widgets.button import Button
 from labyrinths.ui.widgets.label import TextLabel
@@ -33,6 +34,7 @@ class MazeWidget(Widget):
         self.on_move_left: Callable[[], None] = lambda: None
         self.on_move_up: Callable[[], None] = lambda: None
         self.on_move_down: Callable[[], None] = lambda: None
+        self.on_hint: Callable[[], None] = lambda: None
 
         self.mouse_pressed = False
 
@@ -44,6 +46,7 @@ class MazeWidget(Widget):
             30,
             # fmt: off
             text=("Use arrow keys to move.\n"
+                  "Press H for a hint.\n"
                   "WASD or left-click&drag to look around.\n"
                   "Mouse scrolling is supported.\n"
                   "By default, mazes\n"
@@ -60,6 +63,10 @@ class MazeWidget(Widget):
         self.players: dict[int, Player] = {}
 
         self.solution: Solution | None = None
+        # The next cell towards the exit suggested by the host.
+        self.hint: tuple[int, int] | None = None
+        # Player ids, closest to the exit first.
+        self.leaderboard: list[int] = []
         self.winner_name: str | None = None
         self.winner_color: Tuple[int, int, int] | None = None
 
@@ -116,9 +123,9 @@ class MazeWidget(Widget):
     def show_solution(self) -> None:
         """Show solution."""
         assert self.current_maze
-        self.solution = MazeSolver(self.current_maze).solve()
+        self.solution = solution_cache.solve(self.current_maze)
 
-    def set_maze(self, maze: MazeData) -> None:
+    def set_maze(self, maze: MazeData | None) -> None:
         self.current_maze = maze
 
     def set_players(self, player_list: dict[int, Player]) -> None:
@@ -160,6 +167,8 @@ class MazeWidget(Widget):
                 self.on_move_down()
             case pygame.K_RIGHT:
                 self.on_move_right()
+            case pygame.K_h:
+                self.on_hint()
 
     def on_mouse_left_button_down(self) -> None:
         self.mouse_pressed = True
@@ -188,46 +197,52 @@ class MazeWidget(Widget):
     def on_mouse_wheel(self, wheel: int) -> None:
         self.scale_maze(wheel)
 
+    def _visible_range(self, count: int, viewport: int, size: int) -> range:
+        cellsize = max(1, self.cellsize)
+        return range(max(0, viewport // cellsize), min(count, (viewport + size) // cellsize + 1))
+
     def draw_maze(self) -> None:
         maze = self.current_maze
         assert maze is not None
-        for i in range(maze.columns):
-            for j in range(maze.rows):
+        walls = maze.walls
+        dx, dy = self.cellsize, self.cellsize
+        wallwidth = self.wallwidth
+        for i in self._visible_range(maze.columns, self.maze_viewport[0], self.width):
+            for j in self._visible_range(maze.rows, self.maze_viewport[1], self.height):
                 x, y = self._get_begin_of_cell(i, j)
-                dx, dy = self.cellsize, self.cellsize
                 draw.rect(
                     self.surface,
                     "white",
                     pygame.Rect(x, y, dx, dy),
                     0,
                 )
-                celldata = maze.field[i][j]
-                if celldata.left is WallKind.WALL:
+                cell = walls[i * maze.rows + j]
+                if cell & LEFT:
                     draw.rect(
                         self.surface,
                         "black",
-                        pygame.Rect(x, y, self.wallwidth, dy),
+                        pygame.Rect(x, y, wallwidth, dy),
                         0,
                     )
-                if celldata.right is WallKind.WALL:
+                if cell & RIGHT:
                     draw.rect(
                         self.surface,
                         "black",
-                        pygame.Rect(x + dx - self.wallwidth, y, self.wallwidth, dy),
+                        pygame.Rect(x + dx - wallwidth, y, wallwidth, dy),
                         0,
                     )
-                if celldata.up is WallKind.WALL:
+                if cell & UP:
                     draw.rect(
                         self.surface,
                         "black",
-                        pygame.Rect(x, y, dx, self.wallwidth),
+                        pygame.Rect(x, y, dx, wallwidth),
                         0,
                     )
-                if celldata.down is WallKind.WALL:
+                if cell & DOWN:
                     draw.rect(
                         self.surface,
                         "black",
-                        pygame.Rect(x, y + dy - self.wallwidth, dx, self.wallwidth),
+                        pygame.Rect(x, y + dy - wallwidth, dx, wallwidth),
                         0,
                     )
 
@@ -244,6 +259,20 @@ class MazeWidget(Widget):
             xsize, ysize = rendered_text.get_size()
             self.surface.blit(rendered_text, (x - xsize // 2, y - self.cellsize - ysize // 2))
 
+    def draw_hint(self) -> None:
+        assert self.hint is not None
+        draw.circle(self.surface, "gold", self._get_center_of_cell(*self.hint), max(2, self.cellsize // 6))
+
+    def draw_leaderboard(self) -> None:
+        y = 40
+        for place, player_id in enumerate(self.leaderboard, 1):
+            player = self.players.get(player_id)
+            if player is None:
+                continue
+            rendered_text = self.player_name_font.render(f"{place}. {player.client.name}", True, player.client.color)
+            self.surface.blit(rendered_text, (self.width - rendered_text.get_width() - 10, y))
+            y += rendered_text.get_height() + 2
+
     def draw_winner(self) -> None:
         assert self.winner_color is not None
         rendered_text = self.announcement_font.render(f"{self.winner_name} wins", True, self.winner_color)
@@ -255,6 +284,9 @@ class MazeWidget(Widget):
             self.draw_maze()
             if self.solution:
                 self.draw_solution()
+            if self.hint is not None:
+                self.draw_hint()
             self.draw_players()
+            self.draw_leaderboard()
             if self.winner_name is not None:
                 self.draw_winner()
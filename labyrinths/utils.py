@@ -2,8 +2,11 @@
 
 import dataclasses
 import enum
+import functools
 import json
+import operator
 import typing
+from collections.abc import Callable, Sequence
 from types import GenericAlias
 from typing import Any, TypeVar
 
@@ -11,39 +14,79 @@ from typing import Any, TypeVar
 T = TypeVar("T")
 
 
+def _identity(obj: Any) -> Any:
+    return obj
+
+
 # Hard to static type this function, giving up.
 @typing.no_type_check
-def load_from_dict(cls: type[T] | GenericAlias, data: dict | list | Any) -> T:
-    """Load arbitrary annotated class from a dict."""
+@functools.cache
+def _compile_loader(cls: type | GenericAlias) -> Callable[[Any], Any]:
+    """Build a loader for given annotated class. Types are inspected once, loaders are cached per type."""
     annotations: dict[str, Any] | GenericAlias = cls.__annotations__ if hasattr(cls, "__annotations__") else cls
+    args = typing.get_args(cls)
     cls = cls.__origin__ if hasattr(cls, "__origin__") else cls  # type: ignore
 
     if dataclasses.is_dataclass(cls):
-        kwargs = {}
-        for name, annotation in annotations.items():
-            kwargs[name] = load_from_dict(annotation, data[name])
-        return cls(**kwargs)
+        loaders = tuple((name, _compile_loader(annotation)) for name, annotation in annotations.items())
+
+        def load_dataclass(data: dict) -> Any:
+            return cls(**{name: load_field(data[name]) for name, load_field in loaders})
+
+        return load_dataclass
     elif issubclass(cls, enum.Enum):
-        return cls(data)
-    elif issubclass(cls, list):
-        return [load_from_dict(annotations.__args__[0], i) for i in data]
+        members = {member.value: member for member in cls}
+
+        def load_enum(data: Any) -> enum.Enum:
+            try:
+                return members[data]
+            except (KeyError, TypeError):
+                # Let the enum raise its own error or look the value up in its own way.
+                return cls(data)
+
+        return load_enum
+    elif issubclass(cls, list) or cls is Sequence:
+        load_item = _compile_loader(args[0])
+
+        def load_list(data: list) -> list:
+            return [load_item(i) for i in data]
+
+        return load_list
     else:
-        return cls(data)
+        return cls
+
+
+@typing.no_type_check
+def load_from_dict(cls: type[T] | GenericAlias, data: dict | list | Any) -> T:
+    """Load arbitrary annotated class from a dict."""
+    return _compile_loader(cls)(data)
+
+
+@functools.cache
+def _compile_dumper(cls: type) -> Callable[[Any], Any]:
+    """Build a dumper for objects of given class, cached per class."""
+    if dataclasses.is_dataclass(cls):
+        names = tuple(field.name for field in dataclasses.fields(cls))
+
+        def dump_dataclass(obj: Any) -> dict:
+            return {name: dump_to_dict(getattr(obj, name)) for name in names}
+
+        return dump_dataclass
+    elif issubclass(cls, enum.Enum):
+        return operator.attrgetter("value")
+    elif issubclass(cls, Sequence) and not issubclass(cls, (str, bytes)):
+
+        def dump_sequence(obj: Sequence) -> list:
+            return [dump_to_dict(i) for i in obj]
+
+        return dump_sequence
+    else:
+        return _identity
 
 
 def dump_to_dict(obj: Any) -> dict | Any:
     """Dump arbitrary object to a dict."""
-    if dataclasses.is_dataclass(obj):
-        result = {}
-        for name, value in obj.__dict__.items():
-            result[name] = dump_to_dict(value)
-        return result
-    elif isinstance(obj, enum.Enum):
-        return obj.value
-    elif isinstance(obj, list):
-        return [dump_to_dict(i) for i in obj]
-    else:
-        return obj
+    return _compile_dumper(type(obj))(obj)  # type: ignore[arg-type]
 
 
 def load(cls: type[T], data: str) -> T:
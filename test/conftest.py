@@ -1,3 +0,0 @@
-import sys
-
-sys.setrecursionlimit(100_000)
@@ -1,6 +1,6 @@
 """Common test functionality for generators."""
 
-from labyrinths.maze import MazeData, WallKind
+from labyrinths.maze import DOWN, RIGHT, MazeData, WallKind
 
 
 def check_maze_is_correctly_formed(maze: MazeData) -> None:
@@ -18,6 +18,26 @@ def check_maze_is_correctly_formed(maze: MazeData) -> None:
                     assert maze.field[x][y].get_wall_at(dx, dy) == maze.field[x + dx][y + dy].get_wall_at(-dx, -dy)
 
 
+def check_maze_is_perfect(maze: MazeData) -> None:
+    """Check that every cell is reachable and there are no cycles."""
+    walls = maze.walls
+    rows = maze.rows
+    passages = sum(not walls[i] & RIGHT for i in range(len(walls))) + sum(
+        not walls[i] & DOWN for i in range(len(walls))
+    )
+    assert passages == maze.columns * maze.rows - 1
+
+    seen = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            if not maze.has_wall(x, y, dx, dy) and (x + dx, y + dy) not in seen:
+                seen.add((x + dx, y + dy))
+                stack.append((x + dx, y + dy))
+    assert len(seen) == maze.columns * maze.rows
+
+
 def check_maze_has_solution(maze: MazeData) -> None:
     """Check that the maze has a solution."""
     from labyrinths.solver import MazeSolver
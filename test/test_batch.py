@@ -0,0 +1,40 @@
+"""Test generators/batch.py"""
+
+import pytest
+
+from labyrinths.generators.batch import generate_archive, generate_batch
+from labyrinths.generators.registry import get_generator_class
+from labyrinths.mazearchive import MazeArchive
+from labyrinths.mazeloader import load_maze
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_batch(tmp_path, jobs: int) -> None:
+    paths = generate_batch(tmp_path, 5, 6, 4, "dfs", jobs=jobs, seed=1)
+    assert len(set(paths)) == 5
+    assert sorted(tmp_path.iterdir()) == sorted(paths)
+    for path in paths:
+        algo, size, seed = path.stem.split("-")
+        columns, rows = map(int, size.split("x"))
+        assert load_maze(path) == get_generator_class(algo)(columns, rows, int(seed)).generate()
+
+
+def test_generate_batch_is_reproducible(tmp_path) -> None:
+    first = generate_batch(tmp_path / "a", 3, 5, 5, jobs=1, seed=9)
+    second = generate_batch(tmp_path / "b", 3, 5, 5, jobs=1, seed=9)
+    assert [path.name for path in first] == [path.name for path in second]
+
+
+def test_generate_batch_unknown_algo(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        generate_batch(tmp_path, 1, 5, 5, "bogus")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_archive(tmp_path, jobs: int) -> None:
+    path = tmp_path / "mazes.mazedb"
+    assert generate_archive(path, 4, 6, 5, "eller", jobs=jobs, seed=2) == 4
+    assert generate_archive(path, 4, 6, 5, "eller", jobs=jobs, seed=2) == 0
+    with MazeArchive(path) as archive:
+        for entry in archive.find(6, 5, "eller"):
+            assert archive.get(entry.hash) == get_generator_class("eller")(6, 5, entry.seed).generate()
@@ -0,0 +1,43 @@
+"""Test compression.py"""
+
+import pytest
+
+from labyrinths.compression import CODECS, NONE, codec_for_magic, get_codec, get_codec_by_id, measure
+
+SAMPLE = b"labyrinth " * 1000
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_round_trip(name: str) -> None:
+    codec = get_codec(name)
+    compressed = codec.compress(SAMPLE)
+    assert get_codec_by_id(codec.id).decompress(compressed) == SAMPLE
+    compressor = codec.compressor()
+    streamed = compressor.compress(SAMPLE[:5000]) + compressor.compress(SAMPLE[5000:]) + compressor.flush()
+    assert codec.decompress(streamed) == SAMPLE
+
+
+@pytest.mark.parametrize("name", ["gzip", "lzma", "bz2"])
+def test_magic(name: str) -> None:
+    assert codec_for_magic(get_codec(name).compress(SAMPLE)) is get_codec(name)
+
+
+def test_zlib_levels_share_id() -> None:
+    compressed = get_codec("zlib-9").compress(SAMPLE)
+    assert get_codec_by_id(get_codec("zlib-9").id).name == "zlib"
+    assert get_codec_by_id(get_codec("zlib-1").id).decompress(compressed) == SAMPLE
+
+
+def test_unknown() -> None:
+    assert codec_for_magic(b'{"columns"') is NONE
+    with pytest.raises(ValueError):
+        get_codec("zstd")
+    with pytest.raises(ValueError):
+        get_codec_by_id(15)
+
+
+def test_measure() -> None:
+    stats = measure(get_codec("zlib-9"), SAMPLE, repeat=1)
+    assert stats.ratio > 10
+    assert stats.compress_speed > 0 and stats.decompress_speed > 0
+    assert str(stats).startswith("zlib-9: ratio")
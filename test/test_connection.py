@@ -0,0 +1,111 @@
+"""Test connection/connection.py"""
+
+import json
+import socket
+
+from labyrinths.connection.client import ClientToHostConnection
+from labyrinths.connection.connection import FRAME_HEADER, MAX_FRAME_SIZE, MIN_COMPRESSED_SIZE, Connection
+
+
+class RecordingConnection(Connection):
+    def __init__(self, sock: socket.socket) -> None:
+        super().__init__(sock)
+        self.received: list[tuple[str, dict]] = []
+
+    def do_handle_packet(self, ptype: str, data: dict) -> None:
+        self.received.append((ptype, data))
+
+
+def make_frame(ptype: str, data: dict) -> bytes:
+    payload = bytes([0]) + json.dumps({"t": ptype, "d": data}).encode()
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def test_frames_carry_codec() -> None:
+    left_sock, right_sock = socket.socketpair()
+    left, right = RecordingConnection(left_sock), RecordingConnection(right_sock)
+    left.set_codec("lzma")
+    big = {"text": "x" * (MIN_COMPRESSED_SIZE * 4)}
+    left.send_packet("test.small", {})
+    left.send_packet("test.big", big)
+    right.update()
+    assert right.received == [("test.small", {}), ("test.big", big)]
+    # Small packets are not worth compressing.
+    assert set(left.sent_stats) == {"none", "lzma"}
+    assert left.sent_stats["lzma"].ratio > 1
+    assert right.received_stats["lzma"].raw_bytes == left.sent_stats["lzma"].raw_bytes
+    left_sock.close()
+    right_sock.close()
+
+
+def test_frames_split_and_batched() -> None:
+    left_sock, right_sock = socket.socketpair()
+    right = RecordingConnection(right_sock)
+    frames = b"".join(make_frame(f"test.{i}", {"i": i}) for i in range(50))
+    # Length prefixes and frames are cut at arbitrary places.
+    for part in range(0, len(frames), 7):
+        left_sock.send(frames[part : part + 7])
+        right.update()
+    assert right.received == [(f"test.{i}", {"i": i}) for i in range(50)]
+    assert not right.receive_buffer
+    left_sock.close()
+    right_sock.close()
+
+
+def test_large_frame() -> None:
+    left_sock, right_sock = socket.socketpair()
+    left_sock.setblocking(False)
+    right = RecordingConnection(right_sock)
+    data = {"cells": list(range(200_000))}
+    frame = make_frame("game.maze", data)
+    position = 0
+    while position < len(frame):
+        try:
+            position += left_sock.send(frame[position:])
+        except BlockingIOError:
+            pass
+        right.update()
+    assert right.received == [("game.maze", data)]
+    left_sock.close()
+    right_sock.close()
+
+
+def test_frame_too_large() -> None:
+    left_sock, right_sock = socket.socketpair()
+    right = RecordingConnection(right_sock)
+    left_sock.send(FRAME_HEADER.pack(MAX_FRAME_SIZE + 1))
+    right.update()
+    assert right.errored
+    left_sock.close()
+    right_sock.close()
+
+
+def test_send_buffered() -> None:
+    left_sock, right_sock = socket.socketpair()
+    left, right = RecordingConnection(left_sock), RecordingConnection(right_sock)
+    data = {"cells": list(range(200_000))}
+    # Much more than the socket takes at once, the rest is sent on updates.
+    for i in range(3):
+        left.send_packet("game.maze", {"i": i, **data})
+    assert left.send_buffer
+    while left.send_buffer or len(right.received) < 3:
+        left.update()
+        right.update()
+    assert right.received == [("game.maze", {"i": i, **data}) for i in range(3)]
+    left_sock.close()
+    right_sock.close()
+
+
+def test_client_closed_once() -> None:
+    listener = socket.create_server(("127.0.0.1", 0))
+    client = ClientToHostConnection("127.0.0.1", listener.getsockname()[1])
+    events: list[str] = []
+    client.set_handler(lambda ptype, data: events.append(ptype))
+    host_sock, _ = listener.accept()
+    host_sock.close()
+    for _ in range(3):
+        client.update()
+    assert client.errored
+    assert events == ["session.closed"]
+    client.sock.close()
+    listener.close()
@@ -1,7 +1,7 @@
 """Test generators/dfs.py"""
 
 import pytest
-from generators_common import check_maze_has_solution, check_maze_is_correctly_formed
+from generators_common import check_maze_has_solution, check_maze_is_correctly_formed, check_maze_is_perfect
 
 from labyrinths.generators.dfs import DepthFirstSearchGenerator
 
@@ -36,3 +36,15 @@ def test_dfs_generator(gen: DepthFirstSearchGenerator) -> None:
 def test_dfs_has_solution(gen: DepthFirstSearchGenerator) -> None:
     maze = gen.generate()
     check_maze_has_solution(maze)
+
+
+@pytest.mark.parametrize("gen", ["gen2_4", "gen3_2", "gen1_2"], indirect=True)
+def test_dfs_is_perfect(gen: DepthFirstSearchGenerator) -> None:
+    maze = gen.generate()
+    check_maze_is_perfect(maze)
+
+
+def test_dfs_large() -> None:
+    # Used to overflow the stack without raising recursion limit.
+    maze = DepthFirstSearchGenerator(200, 150).generate()
+    check_maze_is_perfect(maze)
@@ -0,0 +1,65 @@
+"""Test generators/difficulty.py"""
+
+import pytest
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.difficulty import DifficultyConstraints, MazeScore, find_maze, score_maze
+from labyrinths.generators.eller import EllerGenerator
+from labyrinths.solver import MazeSolver
+
+
+def test_score_corridor() -> None:
+    maze = EllerGenerator(6, 1).generate()
+    assert score_maze(maze) == MazeScore(solution_length=6, dead_ends=2, dead_end_ratio=2 / 6)
+
+
+def test_score_matches_solver() -> None:
+    maze = DepthFirstSearchGenerator(15, 11, 4).generate()
+    assert score_maze(maze).solution_length == len(MazeSolver(maze).solve().path)
+
+
+def test_constraints() -> None:
+    score = MazeScore(solution_length=20, dead_ends=5, dead_end_ratio=0.25)
+    assert DifficultyConstraints().accepts(score)
+    assert DifficultyConstraints(min_solution_length=20, min_dead_end_ratio=0.2, max_dead_end_ratio=0.3).accepts(score)
+    assert not DifficultyConstraints(min_solution_length=21).accepts(score)
+    assert not DifficultyConstraints(max_dead_end_ratio=0.2).accepts(score)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_find_maze(jobs: int) -> None:
+    constraints = DifficultyConstraints(min_solution_length=30)
+    seed, maze = find_maze(10, 10, "dfs", constraints, deadline=30, jobs=jobs, seed=1)
+    assert maze == DepthFirstSearchGenerator(10, 10, seed).generate()
+    assert constraints.accepts(score_maze(maze))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_find_maze_deadline(jobs: int) -> None:
+    with pytest.raises(TimeoutError):
+        find_maze(5, 5, "kruskal", DifficultyConstraints(min_solution_length=26), deadline=0.2, jobs=jobs)
+
+
+def test_constraints_from_dict() -> None:
+    assert DifficultyConstraints.from_dict({"min_solution_length": 10, "max_dead_end_ratio": 0.5}) == (
+        DifficultyConstraints(min_solution_length=10, max_dead_end_ratio=0.5)
+    )
+    for data in [
+        {"bogus": 1},
+        {"min_solution_length": "10"},
+        {"min_solution_length": 1.5},
+        {"min_dead_end_ratio": 2},
+        {"max_dead_end_ratio": True},
+        [],
+    ]:
+        with pytest.raises(ValueError):
+            DifficultyConstraints.from_dict(data)
+
+
+def test_score_open_border() -> None:
+    maze = EllerGenerator(4, 3).generate()
+    maze.walls[:] = bytes(len(maze.walls))
+    assert score_maze(maze).solution_length == len(MazeSolver(maze).solve().path) == 6
+    maze.walls[:] = bytes([15]) * len(maze.walls)
+    maze.walls[-1] = 0
+    assert score_maze(maze).solution_length == 0
@@ -0,0 +1,63 @@
+"""Test generators/eller.py"""
+
+import pytest
+from generators_common import check_maze_has_solution, check_maze_is_correctly_formed, check_maze_is_perfect
+
+from labyrinths.generators.eller import EllerGenerator
+
+
+@pytest.fixture
+def gen2_4() -> EllerGenerator:
+    return EllerGenerator(2, 4)
+
+
+@pytest.fixture
+def gen3_2() -> EllerGenerator:
+    return EllerGenerator(3, 2)
+
+
+@pytest.fixture
+def gen1_2() -> EllerGenerator:
+    return EllerGenerator(1, 2)
+
+
+@pytest.fixture
+def gen5_1() -> EllerGenerator:
+    return EllerGenerator(5, 1)
+
+
+@pytest.fixture
+def gen(request: pytest.FixtureRequest) -> EllerGenerator:
+    return request.getfixturevalue(request.param)
+
+
+@pytest.mark.parametrize("gen", ["gen2_4", "gen3_2", "gen1_2", "gen5_1"], indirect=True)
+def test_eller_generator(gen: EllerGenerator) -> None:
+    maze = gen.generate()
+    check_maze_is_correctly_formed(maze)
+
+
+@pytest.mark.parametrize("gen", ["gen2_4", "gen3_2", "gen1_2", "gen5_1"], indirect=True)
+def test_eller_has_solution(gen: EllerGenerator) -> None:
+    maze = gen.generate()
+    check_maze_has_solution(maze)
+
+
+@pytest.mark.parametrize("gen", ["gen2_4", "gen3_2", "gen1_2", "gen5_1"], indirect=True)
+def test_eller_is_perfect(gen: EllerGenerator) -> None:
+    maze = gen.generate()
+    check_maze_is_perfect(maze)
+
+
+def test_eller_large() -> None:
+    maze = EllerGenerator(120, 90).generate()
+    check_maze_is_correctly_formed(maze)
+    check_maze_is_perfect(maze)
+
+
+def test_eller_streams_columns() -> None:
+    gen = EllerGenerator(7, 5)
+    columns = list(gen.generate_columns())
+    assert len(columns) == 7
+    assert all(len(column) == 5 for column in columns)
+    assert gen._current is None
@@ -0,0 +1,47 @@
+"""Test game/game.py"""
+
+import pytest
+
+from labyrinths.game.game import Game, maze_from_spec
+from labyrinths.session.types import ClientInfo, Player
+from labyrinths.solver import MazeSolver
+
+
+@pytest.fixture
+def game() -> Game:
+    return Game(9, 7, "dfs", seed=3)
+
+
+def test_spec_reproduces_maze(game: Game) -> None:
+    assert game.spec == {"algo": "dfs", "w": 9, "h": 7, "seed": 3, "version": 1, "hash": game.maze.content_hash()}
+    assert maze_from_spec(game.spec) == game.maze
+
+
+def test_spec_version_mismatch(game: Game) -> None:
+    assert maze_from_spec({**game.spec, "version": 0}) is None
+    assert maze_from_spec({**game.spec, "algo": "bogus"}) is None
+
+
+def test_spec_hash_mismatch(game: Game) -> None:
+    assert maze_from_spec({**game.spec, "hash": "0" * 32}) is None
+
+
+def test_random_seed() -> None:
+    game = Game(5, 5, "kruskal")
+    assert Game(5, 5, "kruskal", game.seed).maze == game.maze
+
+
+def test_pregenerated_maze(game: Game) -> None:
+    assert Game(9, 7, "dfs", 3, game.maze).spec == game.spec
+    with pytest.raises(ValueError):
+        Game(9, 7, "dfs", maze=game.maze)
+
+
+def test_hint_and_ranking(game: Game) -> None:
+    client = ClientInfo("a", (0, 0, 0))
+    game.players = {1: Player(client, 0, 0), 2: Player(client, 8, 6), 3: Player(client, 8, 5)}
+    path = MazeSolver(game.maze).solve().path
+    assert game.hint(1) == path[1]
+    assert game.hint(2) is None
+    assert [client_id for client_id, _ in game.ranking()] == [2, 3, 1]
+    assert game.ranking()[2] == (1, len(path) - 1)
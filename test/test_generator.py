@@ -1,7 +1,10 @@
+import random
+
 import pytest
 from generators_common import check_maze_has_solution
 
 from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.registry import GENERATORS, get_generator_class
 from labyrinths.maze import MazeData, WallKind
 from labyrinths.solver import NoSolution
 
@@ -31,3 +34,36 @@ def test_no_solution() -> None:
     maze = MazeGenerator.get_filled_maze(2, 3)
     with pytest.raises(NoSolution):
         check_maze_has_solution(maze)
+
+
+@pytest.mark.parametrize("algo", GENERATORS.keys())
+def test_seed_is_reproducible(algo: str) -> None:
+    genclass = GENERATORS[algo]
+    assert genclass(12, 9, 42).generate() == genclass(12, 9, 42).generate()
+    assert genclass(12, 9, 42).generate() != genclass(12, 9, 43).generate()
+
+
+@pytest.mark.parametrize("algo", GENERATORS.keys())
+def test_random_instance(algo: str) -> None:
+    genclass = GENERATORS[algo]
+    assert genclass(8, 8, random.Random(7)).generate() == genclass(8, 8, 7).generate()
+
+
+def test_unknown_generator() -> None:
+    with pytest.raises(ValueError):
+        get_generator_class("bogus")
+
+
+@pytest.mark.parametrize("algo", GENERATORS.keys())
+def test_generate_steps(algo: str) -> None:
+    genclass = GENERATORS[algo]
+    gen = genclass(10, 10, 5)
+    steps = sum(1 for _ in gen.generate_steps(step_size=8))
+    assert steps > 5
+    assert gen.current == genclass(10, 10, 5).generate()
+
+
+@pytest.mark.parametrize("algo", GENERATORS.keys())
+def test_generate_steps_size(algo: str) -> None:
+    with pytest.raises(ValueError):
+        next(GENERATORS[algo](4, 4, 1).generate_steps(step_size=0))
@@ -0,0 +1,68 @@
+"""Test junctions.py"""
+
+import random
+
+import pytest
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.junctions import JunctionGraph
+from labyrinths.maze import DOWN, LEFT, RIGHT, MazeData
+from labyrinths.solver import MazeSolver, NoSolution
+
+
+def check_against_solver(maze: MazeData, count: int = 60) -> None:
+    graph = JunctionGraph(maze)
+    rng = random.Random(0)
+    for _ in range(count):
+        begin = rng.randrange(maze.columns), rng.randrange(maze.rows)
+        end = rng.randrange(maze.columns), rng.randrange(maze.rows)
+        path = graph.solve(begin, end).path
+        assert len(path) == len(MazeSolver(maze, begin, end).solve().path)
+        assert path[0] == begin and path[-1] == end
+        for (x, y), (nx, ny) in zip(path, path[1:]):
+            assert abs(nx - x) + abs(ny - y) == 1
+            assert not maze.has_wall(x, y, nx - x, ny - y)
+
+
+@pytest.mark.parametrize("generator, ratio", [(KruskalGenerator, 1.5), (DepthFirstSearchGenerator, 3)])
+def test_perfect_maze(generator: type[MazeGenerator], ratio: float) -> None:
+    maze = generator(21, 15, 3).generate()
+    check_against_solver(maze)
+    graph = JunctionGraph(maze)
+    assert len(graph.nodes) * ratio < maze.columns * maze.rows
+    # Corridors and nodes cover every cell once.
+    assert len(graph.nodes) + sum(len(cells) for _, _, cells in graph.edges) == maze.columns * maze.rows
+
+
+def test_maze_with_loops() -> None:
+    maze = KruskalGenerator(15, 11, 8).generate()
+    rng = random.Random(1)
+    for _ in range(25):
+        x, y = rng.randrange(maze.columns - 1), rng.randrange(maze.rows - 1)
+        maze.walls[maze.index(x, y)] &= ~RIGHT
+        maze.walls[maze.index(x + 1, y)] &= ~LEFT
+    check_against_solver(maze)
+
+
+def test_ring_without_junctions() -> None:
+    # Every cell of a 2x2 maze without inner walls has exactly two openings.
+    maze = MazeGenerator.get_empty_maze(2, 2)
+    graph = JunctionGraph(maze)
+    assert len(graph.nodes) == 1
+    check_against_solver(maze, 10)
+
+
+def test_open_maze() -> None:
+    check_against_solver(MazeGenerator.get_empty_maze(6, 5))
+
+
+def test_no_solution() -> None:
+    maze = MazeGenerator.get_empty_maze(4, 4)
+    for y in range(4):
+        maze.walls[maze.index(1, y)] |= RIGHT
+        maze.walls[maze.index(2, y)] |= LEFT
+    maze.walls[maze.index(0, 0)] |= DOWN
+    with pytest.raises(NoSolution):
+        JunctionGraph(maze).solve((0, 0), (3, 3))
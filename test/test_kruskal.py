@@ -1,7 +1,7 @@
 """Test generators/kruskal.py"""
 
 import pytest
-from generators_common import check_maze_has_solution, check_maze_is_correctly_formed
+from generators_common import check_maze_has_solution, check_maze_is_correctly_formed, check_maze_is_perfect
 
 from labyrinths.generators.kruskal import DisjointSetUnion, KruskalGenerator
 
@@ -56,3 +56,14 @@ def test_kruskal_generator(gen: KruskalGenerator) -> None:
 def test_kruskal_has_solution(gen: KruskalGenerator) -> None:
     maze = gen.generate()
     check_maze_has_solution(maze)
+
+
+@pytest.mark.parametrize("gen", ["gen2_4", "gen3_2", "gen1_2"], indirect=True)
+def test_kruskal_is_perfect(gen: KruskalGenerator) -> None:
+    maze = gen.generate()
+    check_maze_is_perfect(maze)
+
+
+def test_kruskal_large() -> None:
+    maze = KruskalGenerator(150, 100).generate()
+    check_maze_is_perfect(maze)
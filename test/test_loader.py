@@ -1,7 +1,20 @@
 """Test maze loading and dumping."""
 
+import gzip
+import json
+import mmap
+from pathlib import Path
+
+import pytest
+
+from labyrinths import mazeloader
+from labyrinths.compression import CODECS
+from labyrinths.generators.eller import EllerGenerator
 from labyrinths.generators.kruskal import KruskalGenerator
-from labyrinths.mazeloader import dump_maze, load_maze
+from labyrinths.maze import WallKind
+from labyrinths.mazeloader import BINARY_MAGIC, HEADER, convert_maze, decode_maze, dump_maze, encode_maze, load_maze
+from labyrinths.solver import MazeSolver
+from labyrinths.utils import dump_to_dict
 
 
 def test_load_dump(tmp_path) -> None:
@@ -10,3 +23,167 @@ def test_load_dump(tmp_path) -> None:
     dump_maze(maze, path)
     loaded = load_maze(path)
     assert loaded == maze
+
+
+@pytest.mark.parametrize("size", [(2, 3), (5, 5), (1, 1), (7, 4)])
+@pytest.mark.parametrize("compress", [True, False])
+def test_binary_round_trip(size: tuple[int, int], compress: bool) -> None:
+    maze = KruskalGenerator(*size).generate()
+    assert decode_maze(encode_maze(maze, compress)) == maze
+
+
+def test_binary_is_dense() -> None:
+    maze = KruskalGenerator(10, 10).generate()
+    assert len(encode_maze(maze, compress=False)) == HEADER.size + 50
+
+
+def test_format_by_extension(tmp_path) -> None:
+    maze = KruskalGenerator(4, 3).generate()
+    dump_maze(maze, tmp_path / "maze.maze")
+    dump_maze(maze, tmp_path / "maze.json.gz")
+    assert (tmp_path / "maze.maze").read_bytes().startswith(BINARY_MAGIC)
+    assert gzip.decompress((tmp_path / "maze.json.gz").read_bytes()).startswith(b"{")
+
+
+def test_format_by_magic(tmp_path) -> None:
+    maze = KruskalGenerator(4, 3).generate()
+    path = tmp_path / "maze.json.gz"
+    dump_maze(maze, path, binary=True)
+    assert load_maze(path) == maze
+
+
+def test_convert(tmp_path) -> None:
+    maze = KruskalGenerator(6, 5).generate()
+    dump_maze(maze, tmp_path / "maze.json.gz")
+    convert_maze(tmp_path / "maze.json.gz", tmp_path / "maze.maze")
+    convert_maze(tmp_path / "maze.maze", tmp_path / "again.json.gz")
+    assert load_maze(tmp_path / "maze.maze") == maze
+    assert load_maze(tmp_path / "again.json.gz") == maze
+
+
+def test_decode_errors() -> None:
+    data = encode_maze(KruskalGenerator(3, 3).generate())
+    with pytest.raises(ValueError):
+        decode_maze(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        decode_maze(data[:4] + b"\xff" + data[5:])
+    with pytest.raises(ValueError):
+        decode_maze(data[:10])
+    with pytest.raises(ValueError):
+        decode_maze(encode_maze(KruskalGenerator(3, 3).generate(), compress=False)[:-1])
+
+
+def test_mapped(tmp_path) -> None:
+    maze = KruskalGenerator(9, 7).generate()
+    path = tmp_path / "maze.maze"
+    dump_maze(maze, path, mappable=True)
+    mapped = load_maze(path, mapped=True)
+    assert mapped == maze
+    assert load_maze(path) == maze
+    assert MazeSolver(mapped).solve() == MazeSolver(maze).solve()
+    with pytest.raises(TypeError):
+        mapped.field[0][0].left = WallKind.EMPTY
+
+
+def test_mapped_requires_plain_layout(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    mappings = []
+
+    class RecordingMmap(mmap.mmap):
+        def __init__(self, *args, **kwargs) -> None:
+            mappings.append(self)
+
+    monkeypatch.setattr(mmap, "mmap", RecordingMmap)
+    path = tmp_path / "maze.maze"
+    dump_maze(KruskalGenerator(3, 3).generate(), path)
+    with pytest.raises(ValueError):
+        load_maze(path, mapped=True)
+    path.write_bytes(path.read_bytes()[:5])
+    with pytest.raises(ValueError):
+        load_maze(path, mapped=True)
+    # The mapping is closed on every error.
+    assert len(mappings) == 2
+    assert all(mapping.closed for mapping in mappings)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_dump_stream(tmp_path, compress: bool) -> None:
+    maze = EllerGenerator(8, 6).generate()
+    path = tmp_path / "maze.maze"
+    columns = (bytes(maze.walls[x * 6 : (x + 1) * 6]) for x in range(8))
+    mazeloader.dump_maze_stream(path, 8, 6, columns, compress)
+    assert load_maze(path) == maze
+    if not compress:
+        assert load_maze(path, mapped=True) == maze
+
+
+def test_dump_stream_checks_size(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        mazeloader.dump_maze_stream(tmp_path / "maze.maze", 2, 2, [b"\x0f\x0f"])
+    with pytest.raises(ValueError):
+        mazeloader.dump_maze_stream(tmp_path / "maze.maze", 2, 2, [b"\x0f"])
+    # Nothing is left behind, not even a partial file.
+    assert not list(tmp_path.iterdir())
+
+
+def test_dump_stream_keeps_old_file(tmp_path) -> None:
+    maze = EllerGenerator(2, 2).generate()
+    path = tmp_path / "maze.maze"
+    dump_maze(maze, path)
+    with pytest.raises(ValueError):
+        mazeloader.dump_maze_stream(path, 2, 2, [b"\x0f\x0f"])
+    assert load_maze(path) == maze
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_json_stream(tmp_path: Path, chunk_size: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    maze = KruskalGenerator(13, 11, 4).generate()
+    path = tmp_path / "maze.json.gz"
+    path.write_bytes(gzip.compress(json.dumps(dump_to_dict(maze), indent=1).encode()))
+    monkeypatch.setattr(mazeloader._JSONStream, "CHUNK_SIZE", chunk_size)
+    assert load_maze(path) == maze
+
+
+def test_json_stream_key_order(tmp_path: Path) -> None:
+    maze = KruskalGenerator(5, 3, 1).generate()
+    data = dump_to_dict(maze)
+    path = tmp_path / "maze.json.gz"
+    path.write_bytes(
+        gzip.compress(json.dumps({"field": data["field"], "rows": 3, "extra": [1], "columns": 5}).encode())
+    )
+    assert load_maze(path) == maze
+
+
+@pytest.mark.parametrize("text", ['{"columns": 1, "rows": 1, "field": [[{"kind": 0', '{"columns": 1} x', "[]"])
+def test_json_stream_invalid(tmp_path: Path, text: str) -> None:
+    path = tmp_path / "maze.json.gz"
+    path.write_bytes(gzip.compress(text.encode()))
+    with pytest.raises(ValueError):
+        load_maze(path)
+
+
+@pytest.mark.parametrize("name", ["maze.maze.xz", "maze.maze.bz2", "maze.json.xz", "maze.json.bz2", "maze.json"])
+def test_codec_by_suffix(tmp_path: Path, name: str) -> None:
+    maze = KruskalGenerator(9, 8, 2).generate()
+    dump_maze(maze, tmp_path / name)
+    assert load_maze(tmp_path / name) == maze
+
+
+@pytest.mark.parametrize("codec", list(CODECS))
+def test_binary_codecs(codec: str) -> None:
+    maze = KruskalGenerator(9, 8, 2).generate()
+    data = encode_maze(maze, codec=codec)
+    assert decode_maze(data) == maze
+
+
+def test_explicit_codec(tmp_path: Path) -> None:
+    maze = KruskalGenerator(9, 8, 2).generate()
+    dump_maze(maze, tmp_path / "maze.json", codec="none")
+    assert (tmp_path / "maze.json").read_bytes().startswith(b"{")
+    assert load_maze(tmp_path / "maze.json") == maze
+    with pytest.raises(ValueError):
+        dump_maze(maze, tmp_path / "maze.json", codec="zlib")
+    mazeloader.dump_maze_stream(
+        tmp_path / "stream.maze", 9, 8, (bytes(maze.walls[x * 8 : x * 8 + 8]) for x in range(9)), codec="bz2"
+    )
+    assert load_maze(tmp_path / "stream.maze") == maze
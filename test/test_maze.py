@@ -0,0 +1,54 @@
+"""Test maze.py"""
+
+import pytest
+
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, Cell, CellKind, MazeData, MazeField, WallKind
+from labyrinths.utils import dump_to_dict, load_from_dict
+
+
+@pytest.fixture
+def maze() -> MazeData:
+    return MazeGenerator.get_filled_maze(3, 2)
+
+
+def test_cell_view_reads_bits(maze: MazeData) -> None:
+    maze.walls[maze.index(1, 1)] = LEFT | DOWN
+    cell = maze.field[1][1]
+    assert cell.left is WallKind.WALL
+    assert cell.down is WallKind.WALL
+    assert cell.right is WallKind.EMPTY
+    assert cell.up is WallKind.EMPTY
+    assert cell == Cell(CellKind.EMPTY, WallKind.WALL, WallKind.EMPTY, WallKind.EMPTY, WallKind.WALL)
+
+
+def test_cell_view_writes_bits(maze: MazeData) -> None:
+    maze.field[2][0].set_wall_at(0, 1, WallKind.EMPTY)
+    maze.field[2][0].left = WallKind.EMPTY
+    assert maze.walls[maze.index(2, 0)] == RIGHT | UP
+    assert not maze.has_wall(2, 0, 0, 1)
+    assert maze.has_wall(2, 0, 1, 0)
+
+
+def test_field_indexing(maze: MazeData) -> None:
+    assert len(maze.field) == 3
+    assert all(len(column) == 2 for column in maze.field)
+    assert maze.field[-1][-1] == maze.field[2][1]
+    with pytest.raises(IndexError):
+        maze.field[3]
+    with pytest.raises(IndexError):
+        maze.field[0][2]
+
+
+def test_from_cells(maze: MazeData) -> None:
+    cells = [[Cell(c.kind, c.left, c.right, c.up, c.down) for c in column] for column in maze.field]
+    assert MazeData(3, 2, cells) == maze
+    with pytest.raises(ValueError):
+        MazeField.from_cells(2, 2, cells)
+
+
+def test_dict_round_trip() -> None:
+    maze = MazeGenerator.get_empty_maze(2, 3)
+    dumped = dump_to_dict(maze)
+    assert dumped["field"][0][0] == {"kind": 0, "left": 1, "right": 0, "up": 1, "down": 0}
+    assert load_from_dict(MazeData, dumped) == maze
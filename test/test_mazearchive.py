@@ -0,0 +1,86 @@
+"""Test mazearchive.py"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.mazearchive import MazeArchive
+from labyrinths.mazeloader import dump_maze
+from labyrinths.solver import MazeSolver
+
+
+@pytest.fixture
+def archive(tmp_path: Path):
+    with MazeArchive(tmp_path / "mazes.mazedb") as archive:
+        yield archive
+
+
+def test_add_and_get(archive: MazeArchive) -> None:
+    maze = KruskalGenerator(8, 6, 3).generate()
+    assert archive.add(maze, "kruskal", 3)
+    assert not archive.add(KruskalGenerator(8, 6, 3).generate(), "kruskal", 3)
+    assert len(archive) == 1
+    maze_hash = maze.content_hash()
+    assert maze_hash in archive
+    assert archive.get(maze_hash) == maze
+    info = archive.info(maze_hash)
+    assert info is not None
+    assert (info.columns, info.rows, info.algo, info.seed) == (8, 6, "kruskal", 3)
+    assert info.solution_length == len(MazeSolver(maze).solve().path)
+    assert archive.get("0" * 32) is None
+    assert archive.info("0" * 32) is None
+
+
+def test_find_and_random(archive: MazeArchive) -> None:
+    added = archive.add_many(
+        [(KruskalGenerator(6, 4, seed).generate(), "kruskal", seed) for seed in range(5)]
+        + [(DepthFirstSearchGenerator(6, 4, seed).generate(), "dfs", seed) for seed in range(5)]
+        + [(DepthFirstSearchGenerator(5, 5, seed).generate(), "dfs", seed) for seed in range(3)]
+    )
+    assert added == len(archive) == 13
+    assert len(archive.find(6, 4)) == 10
+    assert {entry.seed for entry in archive.find(6, 4, "dfs")} == set(range(5))
+    long_ones = archive.find(min_solution_length=12)
+    assert all(entry.solution_length >= 12 for entry in long_ones)
+
+    rng = random.Random(0)
+    for _ in range(10):
+        picked = archive.random(5, 5, "dfs", rng)
+        assert picked is not None
+        entry, maze = picked
+        assert (entry.columns, entry.rows, entry.algo) == (5, 5, "dfs")
+        assert maze == DepthFirstSearchGenerator(5, 5, entry.seed).generate()
+    assert archive.random(7, 7) is None
+
+
+def test_add_file(archive: MazeArchive, tmp_path: Path) -> None:
+    maze = DepthFirstSearchGenerator(4, 4, 12).generate()
+    dump_maze(maze, tmp_path / "dfs-4x4-12.json.gz")
+    dump_maze(maze, tmp_path / "custom.maze")
+    assert archive.add_file(tmp_path / "dfs-4x4-12.json.gz")
+    assert not archive.add_file(tmp_path / "custom.maze")
+    info = archive.info(maze.content_hash())
+    assert info is not None and (info.algo, info.seed) == ("dfs", 12)
+
+
+def test_reopen(tmp_path: Path) -> None:
+    maze = KruskalGenerator(3, 3, 1).generate()
+    with MazeArchive(tmp_path / "mazes.mazedb") as archive:
+        archive.add(maze)
+    with MazeArchive(tmp_path / "mazes.mazedb") as archive:
+        assert archive.get(maze.content_hash()) == maze
+
+
+def test_random_sees_new_mazes(archive: MazeArchive) -> None:
+    archive.add(DepthFirstSearchGenerator(5, 5, 0).generate(), "dfs", 0)
+    assert archive.random(5, 5, "dfs") is not None
+    assert archive.random(5, 5, "kruskal") is None
+    archive.add(KruskalGenerator(5, 5, 0).generate(), "kruskal", 0)
+    assert archive.random(5, 5, "kruskal") is not None
+    # Written by another connection.
+    with MazeArchive(archive.path) as other:
+        other.add(KruskalGenerator(7, 7, 0).generate(), "kruskal", 0)
+    assert archive.random(7, 7) is not None
@@ -0,0 +1,55 @@
+"""Test pathindex.py"""
+
+import random
+
+import pytest
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.maze import MazeData
+from labyrinths.pathindex import PathIndex
+from labyrinths.solver import MazeSolver, NoSolution
+
+
+def random_pairs(maze: MazeData, count: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    rng = random.Random(0)
+    cells = [(x, y) for x in range(maze.columns) for y in range(maze.rows)]
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("generator", [KruskalGenerator, DepthFirstSearchGenerator])
+def test_matches_solver(generator: type[MazeGenerator]) -> None:
+    maze = generator(23, 17, 5).generate()
+    index = PathIndex(maze, (4, 9))
+    assert index.is_tree
+    for a, b in random_pairs(maze, 50):
+        path = index.path(a, b)
+        assert path == MazeSolver(maze, a, b).solve()
+        assert index.distance(a, b) == len(path.path) - 1
+
+
+def test_lca() -> None:
+    maze = KruskalGenerator(10, 10, 1).generate()
+    index = PathIndex(maze)
+    assert index.lca((0, 0), (7, 3)) == (0, 0)
+    assert index.lca((5, 5), (5, 5)) == (5, 5)
+    lca = index.lca((9, 9), (9, 0))
+    assert lca in index.path((9, 9), (9, 0)).path
+
+
+def test_not_a_tree() -> None:
+    maze = MazeGenerator.get_empty_maze(6, 5)
+    index = PathIndex(maze)
+    assert not index.is_tree
+    assert index.distance((0, 0), (5, 4)) == 9
+    assert index.path((0, 0), (5, 4)) == MazeSolver(maze).solve()
+    with pytest.raises(ValueError):
+        index.lca((0, 0), (1, 1))
+
+
+def test_disconnected() -> None:
+    index = PathIndex(MazeGenerator.get_filled_maze(3, 3))
+    assert not index.is_tree
+    with pytest.raises(NoSolution):
+        index.path((0, 0), (2, 2))
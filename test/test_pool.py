@@ -0,0 +1,63 @@
+"""Test game/pool.py"""
+
+import pytest
+
+from labyrinths.game.pool import MazePool
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.difficulty import DifficultyConstraints, score_maze
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.solver import DistanceField
+
+
+@pytest.fixture
+def pool():
+    pool = MazePool(jobs=1, per_key=2, max_keys=2, max_cells=1000)
+    yield pool
+    pool.close()
+
+
+def test_take_refills(pool: MazePool) -> None:
+    assert pool.take("kruskal", 6, 5) is None
+    pool.wait(timeout=30)
+    assert len(pool.ready[("kruskal", 6, 5)]) == 2
+
+    taken = pool.take("kruskal", 6, 5)
+    assert taken is not None
+    seed, maze, field = taken
+    assert maze == KruskalGenerator(6, 5, seed).generate()
+    assert field.distances == DistanceField(maze).distances
+    pool.wait(timeout=30)
+    assert len(pool.ready[("kruskal", 6, 5)]) == 2
+
+
+def test_recent_keys_only(pool: MazePool) -> None:
+    pool.take("kruskal", 3, 3)
+    pool.take("dfs", 3, 3)
+    pool.take("eller", 3, 3)
+    pool.wait(timeout=30)
+    assert list(pool.ready) == [("dfs", 3, 3), ("eller", 3, 3)]
+
+
+def test_memory_bound(pool: MazePool) -> None:
+    pool.take("kruskal", 20, 20)
+    pool.take("dfs", 20, 20)
+    pool.wait(timeout=30)
+    assert sum(len(ready) for ready in pool.ready.values()) == 2
+
+
+def test_unknown_algo(pool: MazePool) -> None:
+    with pytest.raises(ValueError):
+        pool.take("bogus", 3, 3)
+
+
+def test_find(pool: MazePool) -> None:
+    constraints = DifficultyConstraints(min_solution_length=30)
+    seed, maze, field = pool.find("dfs", 10, 10, constraints, deadline=30, seed=1).result(timeout=60)
+    assert maze == DepthFirstSearchGenerator(10, 10, seed).generate()
+    assert field.distance(0, 0) == score_maze(maze).solution_length - 1
+    assert constraints.accepts(score_maze(maze))
+
+
+def test_find_deadline(pool: MazePool) -> None:
+    with pytest.raises(TimeoutError):
+        pool.find("kruskal", 5, 5, DifficultyConstraints(min_solution_length=26), deadline=0.2).result(timeout=60)
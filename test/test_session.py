@@ -0,0 +1,229 @@
+"""Test session/hostsession.py and session/clientsession.py"""
+
+import json
+from concurrent.futures import Future
+
+import pytest
+from ui_common import pygame_headless
+
+from labyrinths.game.game import Game
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.session.clientsession import ClientSession
+from labyrinths.session.hostsession import HostSession
+from labyrinths.solver import DistanceField, MazeSolver
+from labyrinths.ui.mainwindow import MainWindow
+
+
+class FakeConnection:
+    """Records sent packets. They go through JSON like on the wire."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, dict]] = []
+        self.handler = None
+
+    def set_handler(self, handler) -> None:
+        self.handler = handler
+
+    def send_packet(self, ptype: str, data: dict) -> None:
+        self.sent.append((ptype, json.loads(json.dumps(data))))
+
+    def take(self) -> list[tuple[str, dict]]:
+        sent, self.sent = self.sent, []
+        return sent
+
+
+class FakeConnectionSet:
+    """Host side connections, one per client id."""
+
+    def __init__(self, client_ids: list[int]) -> None:
+        self.connections = {client_id: FakeConnection() for client_id in client_ids}
+        self.handler = None
+
+    def set_handler(self, handler) -> None:
+        self.handler = handler
+
+    def broadcast(self, ptype: str, data: dict) -> None:
+        for conn in self.connections.values():
+            conn.send_packet(ptype, data)
+
+
+class FakePool:
+    """Maze pool without ready mazes, whose searches finish when a test says so."""
+
+    def __init__(self) -> None:
+        self.searches: list[Future] = []
+
+    def take(self, algo: str, columns: int, rows: int) -> None:
+        return None
+
+    def find(self, algo: str, columns: int, rows: int, constraints, deadline: float, seed: int | None = None) -> Future:
+        self.searches.append(Future())
+        return self.searches[-1]
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def conn_set() -> FakeConnectionSet:
+    return FakeConnectionSet([1, 2])
+
+
+@pytest.fixture
+def host(conn_set: FakeConnectionSet) -> HostSession:
+    return HostSession(conn_set)  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def client_conn() -> FakeConnection:
+    return FakeConnection()
+
+
+@pytest.fixture
+def client(pygame_headless, client_conn: FakeConnection) -> ClientSession:
+    return ClientSession(client_conn, MainWindow(800, 600).root_widget)  # type: ignore[arg-type]
+
+
+def deliver(host: HostSession, host_conn: FakeConnection, client: ClientSession, client_conn: FakeConnection) -> None:
+    """Pass packets sent by the host to the client session, and its replies back to the host as client 1."""
+    while host_conn.sent or client_conn.sent:
+        for ptype, data in host_conn.take():
+            client.handle_packet(ptype, data)
+        for ptype, data in client_conn.take():
+            host.handle_packet(1, ptype, data)
+
+
+def test_new_game_regenerated_from_spec(
+    host: HostSession, conn_set: FakeConnectionSet, client: ClientSession, client_conn: FakeConnection
+) -> None:
+    client.handle_packet("connection.established", {})
+    deliver(host, conn_set.connections[1], client, client_conn)
+    game = Game(12, 9, "kruskal", seed=5)
+    host.start_game(game)
+    sent = [ptype for ptype, _ in conn_set.connections[1].sent]
+    assert sent[0] == "game.new"
+    deliver(host, conn_set.connections[1], client, client_conn)
+    assert client.maze == game.maze
+    assert set(client.players) == {1}
+    assert "game.maze" not in sent
+
+
+def test_request_maze_fallback(
+    host: HostSession, conn_set: FakeConnectionSet, client: ClientSession, client_conn: FakeConnection
+) -> None:
+    client.handle_packet("connection.established", {})
+    deliver(host, conn_set.connections[1], client, client_conn)
+    game = Game(12, 9, "kruskal", seed=5)
+    # The client doesn't have this generator version.
+    game.spec["version"] = 0
+    host.start_game(game)
+    for ptype, data in conn_set.connections[1].take():
+        client.handle_packet(ptype, data)
+    assert client.maze is None
+    assert client_conn.sent == [("game.client.request_maze", {})]
+    deliver(host, conn_set.connections[1], client, client_conn)
+    assert client.maze == game.maze
+
+
+def test_join_mid_game(
+    host: HostSession, conn_set: FakeConnectionSet, client: ClientSession, client_conn: FakeConnection
+) -> None:
+    host.handle_packet(2, "session.client.info", {"name": "first"})
+    game = Game(8, 8, "dfs", seed=2)
+    host.start_game(game)
+    host.handle_packet(2, "game.client.movement", {"dir": "down"})
+    assert (game.players[2].x, game.players[2].y) == (0, 1)
+
+    client.handle_packet("connection.established", {})
+    deliver(host, conn_set.connections[1], client, client_conn)
+    assert client.maze == game.maze
+    assert {client_id: (player.x, player.y) for client_id, player in client.players.items()} == {2: (0, 1), 1: (0, 0)}
+    assert client.clients[2].name == "first"
+
+
+@pytest.fixture
+def pool() -> FakePool:
+    return FakePool()
+
+
+@pytest.fixture
+def admin_host(conn_set: FakeConnectionSet, pool: FakePool) -> HostSession:
+    host = HostSession(conn_set, pool)  # type: ignore[arg-type]
+    host.admin_ids = [1]
+    return host
+
+
+def new_game(host: HostSession, **data) -> None:
+    host.handle_packet(1, "admin.new_game", {"algo": "kruskal", "constraints": {"min_solution_length": 20}, **data})
+
+
+def test_search_timeout_falls_back(admin_host: HostSession, conn_set: FakeConnectionSet, pool: FakePool) -> None:
+    new_game(admin_host, w=6, h=5)
+    admin_host.update()
+    assert admin_host.game is None and not conn_set.connections[1].sent
+    pool.searches[0].set_exception(TimeoutError())
+    admin_host.update()
+    assert admin_host.game is not None
+    assert (admin_host.game.maze.columns, admin_host.game.maze.rows) == (6, 5)
+    assert conn_set.connections[1].sent[0] == ("game.new", {"spec": admin_host.game.spec})
+
+
+def test_superseded_search_cancelled(admin_host: HostSession, pool: FakePool) -> None:
+    new_game(admin_host, w=6, h=5)
+    new_game(admin_host, w=7, h=5)
+    assert pool.searches[0].cancelled()
+    maze = KruskalGenerator(7, 5, 9).generate()
+    pool.searches[1].set_result((9, maze, DistanceField(maze)))
+    admin_host.update()
+    assert admin_host.game is not None
+    assert admin_host.game.seed == 9 and admin_host.game.maze == maze
+
+
+def test_failed_search_dropped(admin_host: HostSession, pool: FakePool) -> None:
+    new_game(admin_host, w=6, h=5)
+    pool.searches[0].set_exception(RuntimeError("worker died"))
+    admin_host.update()
+    assert admin_host.game is None and admin_host.search is None
+
+
+@pytest.mark.parametrize("size", [(0, 5), (True, 5), (5.0, 5), ("5", 5), (5000, 5000)])
+def test_invalid_size_ignored(admin_host: HostSession, pool: FakePool, size: tuple) -> None:
+    new_game(admin_host, w=size[0], h=size[1])
+    admin_host.handle_packet(1, "admin.new_game", {"w": size[0], "h": size[1]})
+    assert admin_host.game is None and not pool.searches
+
+
+def test_hint_reply(host: HostSession, conn_set: FakeConnectionSet) -> None:
+    host.handle_packet(1, "session.client.info", {"name": "a"})
+    game = Game(9, 7, "kruskal", seed=4)
+    host.start_game(game)
+    conn_set.connections[1].take()
+    conn_set.connections[2].take()
+    host.handle_packet(1, "game.client.hint", {})
+    x, y = MazeSolver(game.maze).solve().path[1]
+    assert conn_set.connections[1].take() == [("game.hint", {"x": x, "y": y})]
+    assert not conn_set.connections[2].sent
+
+    game.players[1].x, game.players[1].y = 8, 6
+    host.handle_packet(1, "game.client.hint", {})
+    assert conn_set.connections[1].take() == [("game.hint", {})]
+
+
+def test_leaderboard_on_order_change(host: HostSession, conn_set: FakeConnectionSet) -> None:
+    host.handle_packet(1, "session.client.info", {"name": "a"})
+    host.handle_packet(2, "session.client.info", {"name": "b"})
+    host.start_game(Game(5, 5, "kruskal", seed=0, maze=MazeGenerator.get_empty_maze(5, 5)))
+    assert [item["id"] for item in conn_set.connections[1].take()[-1][1]["players"]] == [1, 2]
+
+    def move(client_id: int, direction: str) -> list | None:
+        host.handle_packet(client_id, "game.client.movement", {"dir": direction})
+        boards = [data["players"] for ptype, data in conn_set.connections[1].take() if ptype == "game.leaderboard"]
+        return [item["id"] for item in boards[0]] if boards else None
+
+    assert move(2, "right") == [2, 1]
+    assert move(2, "down") is None
+    assert move(1, "down") is None
+    assert move(1, "down") == [1, 2]
+    # Blocked by the border, nobody moves.
+    assert move(1, "left") is None
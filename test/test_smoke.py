@@ -13,7 +13,7 @@ from labyrinths.session.clientsession import ClientSession
 from labyrinths.session.hostsession import HostSession
 from labyrinths.ui.mainwindow import MainWindow
 from labyrinths.ui.widgets.connectmenu import ConnectMenu
-from labyrinths.ui.widgets.hostmenu import HostMenu
+from labyrinths.ui.widgets.hostmenu import HostedGame, HostMenu
 from labyrinths.ui.widgets.mainmenu import MainMenu
 
 
@@ -22,16 +22,24 @@ def random_port():
     return random.randint(10000, 20000)
 
 
-def test_host_menu(pygame_headless) -> None:
+def test_host_menu(pygame_headless, random_port) -> None:
     mainwindow = MainWindow(800, 600)
     main_menu = MainMenu(mainwindow.root_widget, mainwindow.width, mainwindow.height, 0, 0)
     host_menu = HostMenu(main_menu, main_menu.width, main_menu.height, 0, 0)
+    # The default port stays in TIME_WAIT for a while after the hosted game is closed.
+    host_menu.port_input.text = str(random_port)
     host_menu.host_server()
 
     mainwindow.run(once=True)
     time.sleep(0.1)
     mainwindow.run(once=True)
 
+    (hosted_game,) = [child for child in mainwindow.root_widget.children if isinstance(child, HostedGame)]
+    mainwindow.root_widget.close()
+    assert not hosted_game.server.is_alive()
+    assert hosted_game.host_session.pool is not None
+    assert hosted_game.host_session.pool._executor is None
+
 
 def test_connect_menu(pygame_headless, random_port) -> None:
     # Spin up internal server.
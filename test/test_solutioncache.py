@@ -0,0 +1,73 @@
+"""Test solutioncache.py"""
+
+from pathlib import Path
+
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.maze import MazeData
+from labyrinths.solutioncache import SolutionCache
+from labyrinths.solver import MazeSolver
+
+
+def make_maze(seed: int) -> MazeData:
+    return KruskalGenerator(12, 9, seed).generate()
+
+
+def test_memory_cache() -> None:
+    cache = SolutionCache()
+    maze = make_maze(1)
+    assert cache.get(maze) is None
+    solution = cache.solve(maze)
+    assert solution == MazeSolver(maze).solve()
+    assert cache.get(maze) is solution
+    # Equal maze content hits the same entry.
+    assert cache.solve(make_maze(1)) is solution
+    assert cache.get(maze, (3, 3)) is None
+    assert cache.solve(maze, (3, 3), (0, 8)) == MazeSolver(maze, (3, 3), (0, 8)).solve()
+
+
+def test_lru_eviction() -> None:
+    mazes = [make_maze(seed) for seed in range(3)]
+    solutions = [MazeSolver(maze).solve() for maze in mazes]
+    cache = SolutionCache(max_cells=len(solutions[0].path) + len(solutions[1].path))
+    cache.put(mazes[0], solutions[0])
+    cache.put(mazes[1], solutions[1])
+    assert cache.get(mazes[0]) is solutions[0]
+    cache.put(mazes[2], solutions[2])
+    # The least recently used one goes first.
+    assert cache.get(mazes[1]) is None
+    assert cache.get(mazes[2]) is solutions[2]
+    assert cache.cells <= cache.max_cells
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    maze = make_maze(4)
+    solution = SolutionCache(directory=tmp_path).solve(maze)
+    assert len(list(tmp_path.iterdir())) == 1
+    cached = SolutionCache(directory=tmp_path).get(maze)
+    assert cached == solution
+
+
+def test_disk_eviction(tmp_path: Path) -> None:
+    cache = SolutionCache(directory=tmp_path, max_bytes=1)
+    for seed in range(3):
+        cache.solve(make_maze(seed))
+    # Only the newest file is left over the limit.
+    assert len(list(tmp_path.iterdir())) == 1
+    cache.clear()
+    assert cache.get(make_maze(2)) is not None
+    assert cache.get(make_maze(0)) is None
+
+
+def test_disk_index(tmp_path: Path) -> None:
+    for seed in range(3):
+        SolutionCache(directory=tmp_path).solve(make_maze(seed))
+    sizes = {path.name: path.stat().st_size for path in tmp_path.iterdir()}
+    cache = SolutionCache(directory=tmp_path, max_bytes=sum(sizes.values()))
+    assert dict(cache.files) == sizes
+    assert cache.bytes == sum(sizes.values())
+    # Reading an old file makes it recently used, so another file is evicted instead.
+    assert cache.get(make_maze(0)) is not None
+    cache.solve(make_maze(3))
+    assert cache.get(make_maze(1)) is None
+    assert cache.get(make_maze(0)) is not None
+    assert cache.bytes == sum(path.stat().st_size for path in tmp_path.iterdir())
@@ -0,0 +1,123 @@
+"""Test solver.py"""
+
+import pytest
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.generator import MazeGenerator
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.maze import DOWN, LEFT, RIGHT, UP, MazeData
+from labyrinths.solver import DistanceField, MazeSolver, NoSolution, Solution, solve_many, solve_many_mazes
+
+
+def check_path(maze: MazeData, solution: Solution, begin: tuple[int, int], end: tuple[int, int]) -> None:
+    path = solution.path
+    assert path[0] == begin
+    assert path[-1] == end
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert abs(nx - x) + abs(ny - y) == 1
+        assert not maze.has_wall(x, y, nx - x, ny - y)
+
+
+@pytest.mark.parametrize("mode", MazeSolver.MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_modes_agree(mode: str, seed: int) -> None:
+    maze = KruskalGenerator(17, 13, seed).generate()
+    begin, end = (seed, 2 * seed), (16 - seed, 12)
+    solution = MazeSolver(maze, begin, end, mode=mode).solve()
+    check_path(maze, solution, begin, end)
+    # Perfect maze has the only path.
+    assert solution == MazeSolver(maze, begin, end).solve()
+
+
+@pytest.mark.parametrize("mode", MazeSolver.MODES)
+def test_shortest_in_open_maze(mode: str) -> None:
+    maze = MazeGenerator.get_empty_maze(8, 6)
+    solution = MazeSolver(maze, (1, 1), (6, 4), mode=mode).solve()
+    check_path(maze, solution, (1, 1), (6, 4))
+    assert len(solution.path) == 9
+
+
+@pytest.mark.parametrize("mode", MazeSolver.MODES)
+def test_same_cell(mode: str) -> None:
+    maze = DepthFirstSearchGenerator(3, 3).generate()
+    assert MazeSolver(maze, (1, 1), (1, 1), mode=mode).solve().path == [(1, 1)]
+
+
+@pytest.mark.parametrize("mode", MazeSolver.MODES)
+def test_no_solution(mode: str) -> None:
+    maze = MazeGenerator.get_filled_maze(3, 3)
+    with pytest.raises(NoSolution):
+        MazeSolver(maze, mode=mode).solve()
+
+
+def test_early_termination() -> None:
+    maze = MazeGenerator.get_empty_maze(30, 30)
+    solver = MazeSolver(maze, (0, 0), (1, 0))
+    solver.solve()
+    assert len(solver.queue) < 30 * 30
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError):
+        MazeSolver(MazeGenerator.get_empty_maze(2, 2), mode="dijkstra")
+
+
+def test_open_border() -> None:
+    maze = MazeGenerator.get_empty_maze(4, 3)
+    maze.walls[:] = bytes(len(maze.walls))
+    assert len(MazeSolver(maze).solve().path) == 6
+
+
+def test_distance_field() -> None:
+    maze = KruskalGenerator(15, 11, 2).generate()
+    field = DistanceField(maze)
+    assert field.distance(14, 10) == 0
+    assert field.next_step(14, 10) is None
+    for x, y in [(0, 0), (7, 3), (14, 0)]:
+        path = MazeSolver(maze, (x, y), (14, 10)).solve().path
+        assert field.distance(x, y) == len(path) - 1
+        assert field.next_step(x, y) == path[1]
+        assert field.path_from(x, y).path == path
+
+
+def test_distance_field_unreachable() -> None:
+    field = DistanceField(MazeGenerator.get_filled_maze(3, 3))
+    assert field.distance(0, 0) is None
+    assert field.next_step(0, 0) is None
+    with pytest.raises(NoSolution):
+        field.path_from(0, 0)
+    assert field.rank({1: (0, 0), 2: (2, 2), 3: (1, 1)}) == [(2, 0), (1, None), (3, None)]
+
+
+def test_distance_field_bytes() -> None:
+    maze = KruskalGenerator(9, 7, 4).generate()
+    field = DistanceField(maze)
+    restored = DistanceField.from_bytes(field.to_bytes(), maze)
+    assert (restored.next_cells, restored.distances, restored.goal) == (field.next_cells, field.distances, field.goal)
+    with pytest.raises(ValueError):
+        DistanceField.from_bytes(field.to_bytes(), KruskalGenerator(7, 7, 4).generate())
+
+
+def test_rank() -> None:
+    field = DistanceField(MazeGenerator.get_empty_maze(5, 5))
+    assert field.rank({1: (0, 0), 2: (4, 3), 3: (2, 2)}) == [(2, 1), (3, 4), (1, 8)]
+
+
+def test_solve_many() -> None:
+    maze = KruskalGenerator(14, 10, 7).generate()
+    maze.walls[0] |= DOWN | RIGHT  # Wall off the corner.
+    maze.walls[maze.rows] |= LEFT
+    maze.walls[1] |= UP
+    pairs = [((3, 4), (13, 9)), ((5, 5), (0, 9)), ((3, 4), (3, 4)), ((3, 4), (0, 0)), ((3, 4), (10, 2))]
+    results = solve_many(maze, pairs)
+    assert results[3] is None
+    for (begin, end), result in zip(pairs, results):
+        if result is not None:
+            assert result == MazeSolver(maze, begin, end).solve()
+
+
+def test_solve_many_mazes() -> None:
+    tasks = [(KruskalGenerator(9, 9, seed).generate(), [((0, 0), (8, 8)), ((4, 4), (0, 8))]) for seed in range(3)]
+    expected = [solve_many(maze, pairs) for maze, pairs in tasks]
+    assert solve_many_mazes(tasks, jobs=1) == expected
+    assert solve_many_mazes(tasks, jobs=2) == expected
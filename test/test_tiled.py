@@ -0,0 +1,28 @@
+"""Test generators/tiled.py"""
+
+import pytest
+from generators_common import check_maze_has_solution, check_maze_is_correctly_formed, check_maze_is_perfect
+
+from labyrinths.generators.dfs import DepthFirstSearchGenerator
+from labyrinths.generators.tiled import TiledGenerator
+
+
+@pytest.mark.parametrize("size", [(1, 1), (4, 4), (10, 7), (7, 10), (13, 1)])
+@pytest.mark.parametrize("tile_size", [1, 3, 4])
+def test_tiled_is_perfect(size: tuple[int, int], tile_size: int) -> None:
+    maze = TiledGenerator(*size, seed=1, tile_size=tile_size).generate()
+    check_maze_is_correctly_formed(maze)
+    check_maze_has_solution(maze)
+    check_maze_is_perfect(maze)
+
+
+def test_tiled_parallel_matches_sequential() -> None:
+    sequential = TiledGenerator(30, 20, seed=5, tile_size=8).generate()
+    parallel = TiledGenerator(30, 20, seed=5, tile_size=8, jobs=2).generate()
+    assert parallel == sequential
+    check_maze_is_perfect(parallel)
+
+
+def test_tiled_generator_class() -> None:
+    maze = TiledGenerator(12, 12, seed=2, tile_size=5, tile_generator=DepthFirstSearchGenerator).generate()
+    check_maze_is_perfect(maze)
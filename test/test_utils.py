@@ -3,7 +3,11 @@
 import enum
 from dataclasses import dataclass
 
-from labyrinths.utils import dump_to_dict, load_from_dict
+import pytest
+
+from labyrinths.generators.kruskal import KruskalGenerator
+from labyrinths.maze import MazeData
+from labyrinths.utils import _compile_dumper, _compile_loader, dump_to_dict, load_from_dict
 
 
 class MyEnum(enum.Enum):
@@ -60,3 +64,23 @@ def test_dump_to_dict():
 def test_load_from_dict():
     loaded = load_from_dict(MyDataclass, dict_dataclass)
     assert loaded == my_dataclass
+
+
+def test_loaders_are_cached():
+    assert load_from_dict(MyDataclass, dict_dataclass) == load_from_dict(MyDataclass, dict_dataclass)
+    assert _compile_loader(MyDataclass) is _compile_loader(MyDataclass)
+    assert _compile_dumper(MyDataclass) is _compile_dumper(MyDataclass)
+
+
+def test_invalid_enum_value():
+    with pytest.raises(ValueError):
+        load_from_dict(MyEnum, "missing")
+    with pytest.raises(ValueError):
+        load_from_dict(MyEnum, [])
+
+
+def test_maze_round_trip():
+    maze = KruskalGenerator(7, 5, 1).generate()
+    dumped = dump_to_dict(maze)
+    assert dumped["field"][0][0]["left"] == dumped["field"][0][0]["up"] == 1
+    assert load_from_dict(MazeData, dumped) == maze